@@ -4,9 +4,10 @@ GoPro Camera Management via BLE
 import asyncio
 import threading
 import time
+import uuid as uuid_mod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from open_gopro import GoPro, Params
 from open_gopro.constants import StatusId, SettingId
 import logging
@@ -69,7 +70,7 @@ class CameraInstance:
 
         last4 = self.serial[-4:] if len(self.serial) > 4 else self.serial
         ble_target = f"GoPro {last4}"
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         for attempt in range(2):
             try:
@@ -129,7 +130,7 @@ class CameraInstance:
         """Disconnect BLE"""
         if self.gopro:
             try:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 await loop.run_in_executor(None, self.gopro.close)
                 logger.info(f"[{self.serial}] Disconnected")
             except Exception as e:
@@ -161,6 +162,31 @@ class CameraInstance:
             return result[0], error[0]
         return result[0], None
 
+    async def ble_write(self, uuid, data: bytearray) -> None:
+        """Raw GATT write without parking a thread on it.
+        The Bleak client belongs to the SDK's BLE loop thread (see the singleton patch above),
+        so the write coroutine is scheduled there and awaited from ours. Falls back (logged)
+        to the SDK's blocking write in an executor if those private internals have moved or
+        the direct write fails; the commands sent this way are idempotent."""
+        ble = self.gopro._ble
+        handle = getattr(ble, "_handle", None)
+        ble_loop = getattr(getattr(ble, "_controller", None), "_module_loop", None)
+        if handle is None or ble_loop is None or not ble_loop.is_running():
+            logger.warning(f"[{self.serial}] Direct BLE write unavailable (SDK internals missing), "
+                           f"using SDK write")
+        else:
+            try:
+                # Bleak matches characteristics on the dashed lowercase form (uuid.hex has no dashes)
+                char_uuid = str(uuid_mod.UUID(bytes=uuid.bytes))
+                future = asyncio.run_coroutine_threadsafe(
+                    handle.write_gatt_char(char_uuid, data, response=True), ble_loop
+                )
+                await asyncio.wrap_future(future)
+                return
+            except Exception as e:
+                logger.warning(f"[{self.serial}] Direct BLE write failed ({e}), retrying via SDK write")
+        await asyncio.get_running_loop().run_in_executor(None, ble.write, uuid, data)
+
     def _fire_shutter_raw(self, shutter: "Params.Shutter") -> bool:
         """Fire shutter via raw BLE write — no response wait.
 
@@ -211,7 +237,7 @@ class CameraInstance:
                     timer.daemon = True
                     timer.start()
 
-                    loop = asyncio.get_event_loop()
+                    loop = asyncio.get_running_loop()
                     _, err = await loop.run_in_executor(
                         None,
                         self._ble_cmd_in_thread,
@@ -262,7 +288,7 @@ class CameraInstance:
                     self.gopro._encoding_started.set()
                     await asyncio.sleep(0.5)
 
-                    loop = asyncio.get_event_loop()
+                    loop = asyncio.get_running_loop()
                     _, err = await loop.run_in_executor(
                         None,
                         self._ble_cmd_in_thread,
@@ -294,8 +320,8 @@ class CameraInstance:
             self.recording_start_time = None
             return False
 
-    async def enable_wifi(self) -> bool:
-        """Enable WiFi AP for downloads"""
+    async def enable_wifi(self, settle: float = 3.0) -> bool:
+        """Enable WiFi AP for downloads, then wait `settle` seconds for the AP to come up"""
         try:
             self.update_connection_status()
 
@@ -304,7 +330,7 @@ class CameraInstance:
                 return False
 
             logger.info(f"[{self.serial}] Enabling WiFi...")
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             _, err = await loop.run_in_executor(
                 None,
                 self._ble_cmd_in_thread,
@@ -314,7 +340,8 @@ class CameraInstance:
             )
             if err and err != "timeout":
                 raise err
-            await asyncio.sleep(3)
+            if settle:
+                await asyncio.sleep(settle)
             logger.info(f"[{self.serial}] WiFi enabled")
             return True
 
@@ -338,7 +365,7 @@ class CameraInstance:
                 logger.info(f"[{self.serial}] Enabling preview mode (camera not recording)")
                 self.gopro._encoding_started.set()
                 await asyncio.sleep(0.2)
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 await loop.run_in_executor(
                     None,
                     self._ble_cmd_in_thread,
@@ -383,7 +410,7 @@ class CameraInstance:
             if not self.connected or not self.gopro or not self.gopro.is_ble_connected:
                 return None
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             resp, err = await loop.run_in_executor(
                 None,
                 self._ble_cmd_in_thread,
@@ -430,7 +457,7 @@ class CameraInstance:
         }
 
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             resp, err = await loop.run_in_executor(
                 None,
                 self._ble_cmd_in_thread,
@@ -513,7 +540,7 @@ class CameraInstance:
 
         for name, setting in setting_map.items():
             try:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 resp, err = await loop.run_in_executor(
                     None,
                     self._ble_cmd_in_thread,
@@ -555,7 +582,7 @@ class CameraInstance:
             try:
                 # Look up the enum value by name
                 param_value = params_enum[value_str]
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 _, err = await loop.run_in_executor(
                     None,
                     self._ble_cmd_in_thread,
@@ -691,6 +718,13 @@ class CameraManager:
     def get_camera(self, serial: str) -> Optional[CameraInstance]:
         return self.cameras.get(serial)
 
+    def get_connected_cameras(self, serials: Optional[List[str]] = None) -> List[Tuple[str, CameraInstance]]:
+        """(serial, camera) for each connected camera, optionally limited to `serials`"""
+        if serials is None:
+            return [(s, c) for s, c in self.cameras.items() if c.connected]
+        cameras = self.cameras
+        return [(s, cameras[s]) for s in serials if s in cameras and cameras[s].connected]
+
     def list_cameras(self) -> List[dict]:
         return [cam.to_dict() for cam in self.cameras.values()]
 
@@ -730,7 +764,7 @@ class CameraManager:
             logger.info(f"[{serial}] Quick check for existing BLE connection (target: {ble_target})...")
             camera.gopro = GoPro(target=ble_target, enable_wifi=False)
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             # Use retries=1, timeout=5 so scan finishes fast for missing cameras
             await asyncio.wait_for(
                 loop.run_in_executor(
@@ -750,7 +784,7 @@ class CameraManager:
             logger.debug(f"[{serial}] No existing connection: {e}")
             if camera.gopro:
                 try:
-                    loop = asyncio.get_event_loop()
+                    loop = asyncio.get_running_loop()
                     await loop.run_in_executor(None, camera.gopro.close)
                 except Exception:
                     pass
@@ -853,15 +887,18 @@ class CameraManager:
         return results
 
     async def enable_wifi_all(self) -> Dict[str, bool]:
-        """Enable WiFi on all connected cameras — sequential for BLE stability"""
+        """Enable WiFi on all connected cameras — BLE commands sequential for BLE stability,
+        AP start-up wait shared (one 3s settle instead of one per camera)"""
         results = {}
-        for serial, camera in self.cameras.items():
+        for serial, camera in list(self.cameras.items()):
             if camera.connected:
                 try:
-                    results[serial] = await camera.enable_wifi()
+                    results[serial] = await camera.enable_wifi(settle=0)
                 except Exception as e:
                     logger.error(f"[{serial}] Enable WiFi exception: {e}")
                     results[serial] = False
+        if any(results.values()):
+            await asyncio.sleep(3)
         return results
 
     async def start_preview_all(self) -> Dict[str, dict]:
@@ -876,14 +913,15 @@ class CameraManager:
         return results
 
     async def stop_preview_all(self) -> Dict[str, bool]:
-        results = {}
-        for serial, camera in self.cameras.items():
-            if camera.connected:
-                try:
-                    results[serial] = await camera.stop_webcam()
-                except Exception as e:
-                    results[serial] = False
-        return results
+        # No BLE traffic involved, so all cameras can be stopped at once
+        connected = [(serial, camera) for serial, camera in self.cameras.items() if camera.connected]
+        outcomes = await asyncio.gather(
+            *(camera.stop_webcam() for _, camera in connected), return_exceptions=True
+        )
+        return {
+            serial: outcome if isinstance(outcome, bool) else False
+            for (serial, _), outcome in zip(connected, outcomes)
+        }
 
     async def get_all_health(self) -> dict:
         """Get health for all connected cameras — sequential for BLE stability"""
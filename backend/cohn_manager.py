@@ -8,13 +8,16 @@ Uses bleak directly (independent of open-gopro SDK) for BLE provisioning.
 After provisioning, cameras are controlled via HTTPS with basic auth.
 """
 import asyncio
+import base64
 import json
 import logging
 import os
 import ssl
 import struct
 import subprocess
+import sys
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Callable
@@ -42,6 +45,13 @@ CERT_DIR = Path(tempfile.gettempdir()) / "gopro_cohn_certs"
 # BLE debug logging (enable with GOPRO_BLE_DEBUG=1)
 BLE_DEBUG = os.environ.get("GOPRO_BLE_DEBUG", "").strip() in ("1", "true", "yes")
 
+# ARP table dump; -n skips reverse DNS per entry (Windows arp has no -n and never resolves names)
+ARP_COMMAND = ['arp', '-a'] if sys.platform == "win32" else ['arp', '-an']
+
+# Minimum spacing between mDNS/ARP IP recovery attempts for an unreachable camera.
+# The reachability probe itself runs on every online check.
+IP_RECOVERY_INTERVAL_S = 30.0
+
 
 class COHNManager:
     def __init__(self):
@@ -52,6 +62,9 @@ class COHNManager:
         self._notification_data: Dict[str, asyncio.Queue] = {}
         self._reassembly_buffers: Dict[str, dict] = {}
         self._provisioning_locks: Dict[str, asyncio.Lock] = {}
+        self._auth_headers: Dict[str, str] = {}  # serial -> "Basic ..." (cleared on every save)
+        self._status_views: Optional[Dict[str, dict]] = None  # serial -> public status fields
+        self._ip_recovery_at: Dict[str, float] = {}  # serial -> monotonic time of last mDNS/ARP recovery
         self._load()
 
     # ============== Persistence ==============
@@ -99,6 +112,9 @@ class COHNManager:
 
     def _save(self):
         """Save credentials to cohn_credentials.json (v2 multi-network format)"""
+        # Every credential change goes through here, so derived caches reset with it
+        self._auth_headers.clear()
+        self._status_views = None
         # Sync active network's data back into all_networks
         if self.wifi_ssid:
             self.all_networks[self.wifi_ssid] = {
@@ -918,7 +934,9 @@ class COHNManager:
             if not ip_address or '.' not in ip_address:
                 logger.info(f"[COHN {serial}] No IP from BLE, trying network scan...")
                 try:
-                    arp_output = subprocess.check_output(['arp', '-a'], text=True, timeout=10)
+                    arp_output = await asyncio.to_thread(
+                        subprocess.check_output, ARP_COMMAND, text=True, timeout=10
+                    )
                     if mac_address:
                         mac_lower = mac_address.lower().replace(':', '').replace('-', '')
                         for line in arp_output.split('\n'):
@@ -1052,6 +1070,22 @@ class COHNManager:
         """All provisioned cameras"""
         return self.credentials.copy()
 
+    def get_status_views(self) -> Dict[str, dict]:
+        """Public per-camera status fields (no secrets), rebuilt only after credentials change.
+        Callers overlay "online" onto a copy; don't mutate the returned dicts."""
+        if self._status_views is None:
+            self._status_views = {
+                serial: {
+                    "provisioned": True,
+                    "ip_address": creds.get("ip_address"),
+                    "username": creds.get("username"),
+                    "mac_address": creds.get("mac_address"),
+                    "provisioned_at": creds.get("provisioned_at"),
+                }
+                for serial, creds in self.credentials.items()
+            }
+        return self._status_views
+
     def is_provisioned(self, serial: str) -> bool:
         """Quick check if camera has COHN credentials"""
         return serial in self.credentials
@@ -1065,15 +1099,18 @@ class COHNManager:
         return False
 
     def get_auth_header(self, serial: str) -> Optional[str]:
-        """Return Basic auth header value"""
+        """Return Basic auth header value (memoized until credentials change)"""
+        header = self._auth_headers.get(serial)
+        if header is not None:
+            return header
         creds = self.credentials.get(serial)
         if not creds:
             return None
-        import base64
         auth = base64.b64encode(
             f"{creds['username']}:{creds['password']}".encode()
         ).decode()
-        return f"Basic {auth}"
+        header = self._auth_headers[serial] = f"Basic {auth}"
+        return header
 
     def get_https_base_url(self, serial: str) -> Optional[str]:
         """Return https://{ip}"""
@@ -1166,39 +1203,52 @@ class COHNManager:
             zc.close()
         return None
 
-    def _recover_ip_by_mac(self, serial: str) -> Optional[str]:
+    @classmethod
+    def _find_ip_in_arp(cls, arp_output: str, mac: str, current_ip: Optional[str]) -> Optional[str]:
+        """Return the first IP in an ARP table dump whose MAC matches, skipping current_ip."""
+        # Normalize stored MAC: lowercase, strip colons/dashes
+        mac_lower = mac.lower().replace(':', '').replace('-', '')
+        if not mac_lower:
+            return None
+
+        for line in arp_output.split('\n'):
+            ip_candidate, line_mac = cls._parse_arp_line(line)
+            if not line_mac:
+                continue
+            if mac_lower in line_mac or line_mac in mac_lower:
+                if ip_candidate and '.' in ip_candidate and ip_candidate != current_ip:
+                    return ip_candidate
+        return None
+
+    async def _recover_ip_by_mac(self, serial: str) -> Optional[str]:
         """ARP-scan for a camera's MAC address to find its current IP.
-        Returns new IP if found, else None. Updates stored credentials on success."""
+        Returns new IP if found, else None. Updates stored credentials on success.
+        Only arp runs in a worker thread; matching and the save stay on the event loop."""
         creds = self.credentials.get(serial)
         if not creds:
             return None
-        mac = creds.get("mac_address", "")
-        if not mac:
+        if not creds.get("mac_address"):
             logger.debug(f"[COHN {serial}] No MAC address stored, cannot recover IP")
             return None
 
         try:
-            arp_output = subprocess.check_output(['arp', '-a'], text=True, timeout=10)
+            arp_output = await asyncio.to_thread(
+                subprocess.check_output, ARP_COMMAND, text=True, timeout=10
+            )
         except Exception as e:
             logger.warning(f"[COHN {serial}] ARP scan failed: {e}")
             return None
 
-        # Normalize stored MAC: lowercase, strip colons/dashes
-        mac_lower = mac.lower().replace(':', '').replace('-', '')
-        if not mac_lower:
+        # Credentials may have been replaced or removed while arp ran
+        creds = self.credentials.get(serial)
+        if not creds or not creds.get("mac_address"):
             return None
-
-        for line in arp_output.split('\n'):
-            ip_candidate, line_mac = self._parse_arp_line(line)
-            if not line_mac:
-                continue
-            if mac_lower in line_mac or line_mac in mac_lower:
-                if ip_candidate and '.' in ip_candidate and ip_candidate != creds.get('ip_address'):
-                    logger.info(f"[COHN {serial}] IP recovered via ARP: {creds.get('ip_address')} -> {ip_candidate}")
-                    creds['ip_address'] = ip_candidate
-                    self._save()
-                    return ip_candidate
-        return None
+        new_ip = self._find_ip_in_arp(arp_output, creds["mac_address"], creds.get('ip_address'))
+        if new_ip:
+            logger.info(f"[COHN {serial}] IP recovered via ARP: {creds.get('ip_address')} -> {new_ip}")
+            creds['ip_address'] = new_ip
+            self._save()
+        return new_ip
 
     def update_ip(self, serial: str, ip_address: str) -> bool:
         """Manually update a camera's stored IP address."""
@@ -1224,7 +1274,8 @@ class COHNManager:
 
     async def check_camera_online(self, serial: str) -> bool:
         """Check if a COHN-provisioned camera is reachable via HTTPS.
-        If unreachable and MAC is stored, attempts ARP-based IP recovery."""
+        If unreachable, attempts mDNS then ARP-based IP recovery, at most once
+        per IP_RECOVERY_INTERVAL_S per camera."""
         creds = self.credentials.get(serial)
         if not creds or not creds.get('ip_address'):
             return False
@@ -1244,8 +1295,16 @@ class COHNManager:
 
         # Try stored IP first
         if await _try_reach(creds['ip_address']):
+            self._ip_recovery_at.pop(serial, None)
             return True
 
+        # Recovery browses mDNS for seconds and dumps the ARP table — keep it off the fast probe cadence
+        now = time.monotonic()
+        last = self._ip_recovery_at.get(serial)
+        if last is not None and now - last < IP_RECOVERY_INTERVAL_S:
+            return False
+        self._ip_recovery_at[serial] = now
+
         # Stored IP failed — try mDNS discovery (works on HERO12, not HERO13)
         mdns_ip = await self._discover_ip_by_mdns(serial)
         if mdns_ip:
@@ -1255,7 +1314,7 @@ class COHNManager:
 
         # mDNS failed — try ARP recovery if MAC is available
         if creds.get('mac_address'):
-            new_ip = self._recover_ip_by_mac(serial)
+            new_ip = await self._recover_ip_by_mac(serial)
             if new_ip:
                 if await _try_reach(new_ip):
                     logger.info(f"[COHN {serial}] Camera recovered via ARP at {new_ip}")
@@ -2,17 +2,21 @@
 Download Manager for GoPro Videos
 """
 import asyncio
+import mmap
 import re
+import zipfile
 import requests
 import httpx
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Callable
+from typing import Optional, List, Dict, Callable, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 GOPRO_IP = "http://10.5.5.9:8080"
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB slices for streamed uploads
+DIRECT_UPLOAD_LIMIT = 32 * 1024 * 1024  # Larger uploads go through a presigned URL
 
 
 def format_size(size_bytes: int) -> str:
@@ -27,6 +31,70 @@ def format_size(size_bytes: int) -> str:
         return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
 
 
+def stored_zip_size(entries: List[Tuple[str, int]]) -> int:
+    """Exact byte size of a ZIP_STORED archive written by zipfile to a non-seekable stream.
+
+    entries is a list of (arcname, file_size). Mirrors zipfile's layout: local
+    header + data + data descriptor per entry, then the central directory and
+    end record (with ZIP64 extras wherever zipfile would emit them).
+    """
+    total = 0
+    central = 0
+    for arcname, file_size in entries:
+        try:
+            name_len = len(arcname.encode('ascii'))
+        except UnicodeEncodeError:
+            name_len = len(arcname.encode('utf-8'))
+        header_offset = total
+        zip64 = file_size * 1.05 > zipfile.ZIP64_LIMIT
+        total += 30 + name_len + (20 if zip64 else 0)   # local header (+ ZIP64 extra)
+        total += file_size
+        total += 24 if zip64 else 16                    # data descriptor
+
+        extra_fields = 0
+        if file_size > zipfile.ZIP64_LIMIT:
+            extra_fields += 2
+        if header_offset > zipfile.ZIP64_LIMIT:
+            extra_fields += 1
+        central += 46 + name_len + (4 + 8 * extra_fields if extra_fields else 0)
+
+    if (len(entries) > zipfile.ZIP_FILECOUNT_LIMIT
+            or total > zipfile.ZIP64_LIMIT or central > zipfile.ZIP64_LIMIT):
+        central += 56 + 20  # ZIP64 end record + locator
+    return total + central + 22
+
+
+class _ZipQueueWriter:
+    """Write-only sink that hands zipfile output to an asyncio.Queue from a worker thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        self._loop = loop
+        self._queue = queue
+        self._buf = bytearray()
+        self.cancelled = False
+
+    def _put(self, item):
+        if self.cancelled:
+            raise IOError("ZIP stream consumer went away")
+        asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
+    def write(self, data) -> int:
+        self._buf += data
+        if len(self._buf) >= UPLOAD_CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._buf:
+            chunk = bytes(self._buf)
+            self._buf.clear()
+            self._put(chunk)
+
+    def close(self):
+        if not self.cancelled:
+            self._put(None)
+
+
 class DownloadManager:
     def __init__(self, download_dir: Optional[Path] = None):
         if download_dir is None:
@@ -356,14 +424,14 @@ class DownloadManager:
     def download_selected_from_camera(
         self,
         serial: str,
-        file_list: List[Dict],
+        file_list: List[Tuple[str, str]],
         progress_callback: Optional[Callable[[str, int, int, int], None]] = None,
         shoot_name: Optional[str] = None,
         take_number: Optional[int] = None
     ) -> List[Path]:
         """
         Download selected files from camera.
-        file_list: list of {directory, filename} dicts
+        file_list: list of (directory, filename) tuples
         progress_callback(filename, current_file_idx, total_files, percent)
         """
         downloaded_files = []
@@ -380,9 +448,7 @@ class DownloadManager:
                 today = datetime.now().strftime("%Y-%m-%d")
                 output_base = self.download_dir / f"{today}_GoPro{serial}"
 
-            for idx, file_info in enumerate(file_list, 1):
-                directory = file_info["directory"]
-                filename = file_info["filename"]
+            for idx, (directory, filename) in enumerate(file_list, 1):
                 url = f"{GOPRO_IP}/videos/DCIM/{directory}/{filename}"
 
                 logger.info(f"[{idx}/{total_files}] {filename}")
@@ -410,6 +476,93 @@ class DownloadManager:
             logger.error(f"Selected download failed: {e}", exc_info=True)
             return downloaded_files
 
+    @staticmethod
+    async def iter_file_chunks(file_path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        """Yield a file in fixed-size slices from a read-only memory map.
+
+        Only one slice is resident at a time, so multi-GB archives can be
+        streamed to the HTTP layer without loading the whole file.
+        """
+        with open(file_path, 'rb') as f:
+            file_size = f.seek(0, 2)
+            if file_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(0, file_size, chunk_size):
+                    yield mm[offset:offset + chunk_size]
+
+    @staticmethod
+    async def iter_stored_zip(entries: List[Tuple[Path, str]]):
+        """Yield a ZIP_STORED archive of (path, arcname) entries as it is built.
+
+        zipfile runs in a worker thread and pushes ~8 MiB chunks through a small
+        bounded queue, so nothing touches disk and memory stays flat.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        writer = _ZipQueueWriter(loop, queue)
+
+        def build():
+            try:
+                with zipfile.ZipFile(writer, 'w', zipfile.ZIP_STORED) as zf:
+                    for path, arcname in entries:
+                        zf.write(path, arcname=arcname)
+                writer.flush()
+            finally:
+                writer.close()
+
+        future = loop.run_in_executor(None, build)
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+            await future
+        finally:
+            if not future.done():
+                # Consumer stopped early: unblock the worker so it can bail out
+                writer.cancelled = True
+                while not future.done():
+                    while not queue.empty():
+                        queue.get_nowait()
+                    await asyncio.sleep(0.05)
+                future.exception()  # Expected "consumer went away" error; don't log it
+
+    async def upload_zip_to_backend(
+        self,
+        entries: List[Tuple[Path, str]],
+        s3_key: str,
+        backend_url: str,
+        api_key: str
+    ) -> Tuple[Optional[str], int]:
+        """Build a ZIP of (path, arcname) entries on the fly and upload it.
+
+        Media is already compressed, so entries are STORED; that makes the
+        archive size known up front and lets the presigned PUT stream the
+        ZIP with a proper Content-Length. Returns (url, zip_size).
+        """
+        if not backend_url or not backend_url.startswith('http'):
+            raise ValueError(f"Invalid backend URL: {backend_url}")
+
+        zip_size = stored_zip_size([(arcname, path.stat().st_size) for path, arcname in entries])
+        zip_name = s3_key.rsplit('/', 1)[-1]
+        logger.info(f"Uploading: {zip_name} ({zip_size / (1024 * 1024):.1f} MB, streamed)")
+
+        if zip_size > DIRECT_UPLOAD_LIMIT:
+            logger.info(f"ZIP is > 32MB, using presigned URL method")
+            url = await self._put_presigned(
+                self.iter_stored_zip(entries), zip_size, zip_name,
+                s3_key, backend_url, api_key, "application/zip"
+            )
+        else:
+            logger.info(f"ZIP is <= 32MB, using direct upload")
+            data = b"".join([chunk async for chunk in self.iter_stored_zip(entries)])
+            url = await self._post_direct(
+                data, len(data), zip_name, s3_key, backend_url, api_key, "application/zip"
+            )
+        return url, zip_size
+
     async def upload_file_to_backend(
         self,
         file_path: Path,
@@ -431,7 +584,7 @@ class DownloadManager:
         file_size_mb = file_size / (1024 * 1024)
         logger.info(f"Uploading: {file_path.name} ({file_size_mb:.1f} MB)")
 
-        if file_size > 32 * 1024 * 1024:
+        if file_size > DIRECT_UPLOAD_LIMIT:
             logger.info(f"File is > 32MB, using presigned URL method")
             return await self._upload_via_presigned(
                 file_path, s3_key, backend_url, api_key, content_type
@@ -470,29 +623,51 @@ class DownloadManager:
         content_type: str = "video/mp4"
     ) -> Optional[str]:
         """Direct multipart upload for files <= 32MB. Returns URL or None."""
+        with open(file_path, 'rb') as f:
+            return await self._post_direct(
+                f, file_path.stat().st_size, file_path.name,
+                s3_key, backend_url, api_key, content_type,
+                fallback=lambda: self._upload_via_presigned(
+                    file_path, s3_key, backend_url, api_key, content_type
+                )
+            )
+
+    async def _post_direct(
+        self,
+        content,
+        size: int,
+        name: str,
+        s3_key: str,
+        backend_url: str,
+        api_key: str,
+        content_type: str,
+        fallback: Optional[Callable] = None
+    ) -> Optional[str]:
+        """Multipart POST of a file object or bytes. Falls back to presigned on 413."""
         try:
-            with open(file_path, 'rb') as f:
-                files = {"file": (file_path.name, f, content_type)}
-                data = {"s3Key": s3_key}
-                headers = {"X-API-Key": api_key}
-
-                async with httpx.AsyncClient(timeout=300.0) as client:
-                    logger.info(f"Sending POST request to {backend_url}")
-                    resp = await client.post(backend_url, files=files, data=data, headers=headers)
-                    resp.raise_for_status()
-                    result = resp.json()
-                    logger.info(f"Response status: {resp.status_code}")
+            files = {"file": (name, content, content_type)}
+            data = {"s3Key": s3_key}
+            headers = {"X-API-Key": api_key}
+
+            async with httpx.AsyncClient(timeout=300.0) as client:
+                logger.info(f"Sending POST request to {backend_url}")
+                resp = await client.post(backend_url, files=files, data=data, headers=headers)
+                resp.raise_for_status()
+                result = resp.json()
+                logger.info(f"Response status: {resp.status_code}")
 
             url = result.get("url") or result.get("fileUrl") or result.get("s3Url")
-            logger.info(f"✅ Uploaded: {file_path.name}")
+            logger.info(f"✅ Uploaded: {name}")
             return url
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 413:
                 logger.error(f"❌ File too large for direct upload (413)")
                 logger.info(f"Retrying with presigned URL method...")
-                return await self._upload_via_presigned(
-                    file_path, s3_key, backend_url, api_key, content_type
+                if fallback is not None:
+                    return await fallback()
+                return await self._put_presigned(
+                    content, size, name, s3_key, backend_url, api_key, content_type
                 )
             raise
 
@@ -505,6 +680,23 @@ class DownloadManager:
         content_type: str = "video/mp4"
     ) -> Optional[str]:
         """Upload via presigned URL (streaming, no full file read). Returns URL."""
+        # Stream file directly in mmap'd slices (no f.read() into memory)
+        return await self._put_presigned(
+            self.iter_file_chunks(file_path), file_path.stat().st_size, file_path.name,
+            s3_key, backend_url, api_key, content_type
+        )
+
+    async def _put_presigned(
+        self,
+        content,
+        size: int,
+        name: str,
+        s3_key: str,
+        backend_url: str,
+        api_key: str,
+        content_type: str
+    ) -> Optional[str]:
+        """PUT bytes or an async byte stream of known size to a presigned URL. Returns URL."""
         # Step 1: Get presigned upload URL
         presigned_url = backend_url.replace('/upload-file', '/upload-file-presigned')
         logger.info(f"Step 1: Getting presigned URL from {presigned_url}")
@@ -528,16 +720,14 @@ class DownloadManager:
         logger.info(f"✓ Got presigned URL")
         logger.info(f"Step 2: Uploading directly to Azure storage...")
 
-        # Step 2: Stream file directly (no f.read() into memory)
-        file_size = file_path.stat().st_size
-        upload_headers["Content-Length"] = str(file_size)
+        # Step 2: Stream the body; Azure needs an explicit Content-Length
+        upload_headers["Content-Length"] = str(size)
 
-        with open(file_path, 'rb') as f:
-            async with httpx.AsyncClient(timeout=600.0) as client:
-                resp = await client.put(upload_url, headers=upload_headers, content=f)
-                resp.raise_for_status()
+        async with httpx.AsyncClient(timeout=600.0) as client:
+            resp = await client.put(upload_url, headers=upload_headers, content=content)
+            resp.raise_for_status()
 
-        logger.info(f"✅ Uploaded: {file_path.name} (via presigned URL)")
+        logger.info(f"✅ Uploaded: {name} (via presigned URL)")
         logger.info(f"File URL: {file_url}")
         return file_url
 
@@ -630,12 +820,14 @@ class DownloadManager:
 
         return files
 
-    def get_files_grouped_by_camera(self) -> Dict[str, List[Dict]]:
-        """Get all files grouped by camera serial number and folder"""
+    def get_files_grouped_by_camera(self, serial: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """Get all files grouped by camera serial number and folder.
+        With `serial`, only that camera's folders (matched on the parsed serial, and
+        other cameras' directories are never listed)."""
         grouped = {}
 
         # Get all files
-        all_files = self.get_downloaded_files()
+        all_files = self.get_downloaded_files(serial)
 
         # Group by folder name (which includes date and camera)
         for file_info in all_files:
@@ -956,7 +1148,7 @@ class DownloadManager:
         serial: str,
         base_url: str,
         auth_header: str,
-        file_list: List[Dict],
+        file_list: List[Tuple[str, str]],
         progress_callback: Optional[Callable] = None,
         shoot_name: Optional[str] = None,
         take_number: Optional[int] = None
@@ -975,9 +1167,7 @@ class DownloadManager:
                 today = datetime.now().strftime("%Y-%m-%d")
                 output_base = self.download_dir / f"{today}_GoPro{serial}"
 
-            for idx, file_info in enumerate(file_list, 1):
-                directory = file_info["directory"]
-                filename = file_info["filename"]
+            for idx, (directory, filename) in enumerate(file_list, 1):
                 url = f"{base_url}/videos/DCIM/{directory}/{filename}"
 
                 logger.info(f"[{idx}/{total_files}] {filename}")
@@ -13,9 +13,11 @@ hiddenimports = [
     'uvicorn.logging',
     'uvicorn.loops',
     'uvicorn.loops.auto',
+    'uvicorn.loops.uvloop',
     'uvicorn.protocols',
     'uvicorn.protocols.http',
     'uvicorn.protocols.http.auto',
+    'uvicorn.protocols.http.httptools_impl',
     'uvicorn.protocols.websockets',
     'uvicorn.protocols.websockets.auto',
     'uvicorn.lifespan',
@@ -29,6 +31,7 @@ hiddenimports = [
     'starlette.middleware.cors',
     'pydantic',
     'pydantic_core',
+    'orjson',
 
     # HTTP clients
     'httpx',
@@ -1,23 +1,30 @@
 """
 FastAPI Backend for GoPro Desktop App
 """
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import Any, Awaitable, Callable, List, Optional, Dict, Set, Tuple
 import asyncio
-import ssl
+import os
 import sys
 import tempfile
-import base64
+import time
+import atexit
 import logging
+import logging.handlers
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
 
+import anyio
 import httpx
 import subprocess
 import shutil
-import signal
 import socket
 import threading
 
@@ -42,19 +49,59 @@ class _TeeHandler(logging.Handler):
         except Exception:
             pass
 
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 _tee = _TeeHandler()
-_tee.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-)
-# Attach to root so ALL loggers (main, camera_manager, open_gopro, uvicorn) get captured
-logging.getLogger().addHandler(_tee)
+_tee.setFormatter(_log_formatter)
+_console = logging.StreamHandler()
+_console.setFormatter(_log_formatter)
+
+# Callers (often the event loop) only enqueue; a listener thread does the console/file writes
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+# LOG_LEVEL=WARNING quiets the per-request banners in production
+_log_level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+logging.basicConfig(level=_log_level, handlers=[logging.handlers.QueueHandler(_log_queue)])
+# Attached to root so ALL loggers (main, camera_manager, open_gopro, uvicorn) get captured
+_log_listener = logging.handlers.QueueListener(_log_queue, _console, _tee)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Drains queued records on exit
 logger = logging.getLogger(__name__)
+_BAR = "=" * 60  # Log banner separator
+
+# orjson serializes large status/snapshot payloads several times faster than stdlib json
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+
+    def _json_text(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    from fastapi.responses import JSONResponse as _DefaultResponse
+
+    def _json_text(obj) -> str:
+        # Same encoding Starlette's send_json uses
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    _json_loads = json.loads
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run startup/shutdown around the app's lifetime"""
+    # Starlette's threadpool (file responses, any sync handler) defaults to 40 threads,
+    # which bursts across many cameras can exhaust
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 100
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+
 
 # Initialize FastAPI
-app = FastAPI(title="GoPro Desktop App API")
+app = FastAPI(title="GoPro Desktop App API", default_response_class=_DefaultResponse, lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -75,25 +122,52 @@ cohn_manager = COHNManager()
 CERT_DIR = Path(tempfile.gettempdir()) / "gopro_cohn_certs"
 
 # COHN streaming: UDP → ffmpeg (H.265→H.264 transcode) → chunked HTTP → mpegts.js in browser
-import queue
 _cohn_ip_to_serial: Dict[str, str] = {}  # camera IP -> serial (for UDP demux)
-_cohn_stream_clients: Dict[str, List[queue.Queue]] = {}  # serial -> list of client queues
+_fast_ip_table: List[Optional[tuple]] = [None] * 256  # last octet -> (ip, serial), hot-path demux
+_cohn_stream_clients: Dict[str, List[asyncio.Queue]] = {}  # serial -> list of client queues
 _cohn_ffmpeg_procs: Dict[str, subprocess.Popen] = {}  # serial -> ffmpeg transcoder
 _cohn_reader_threads: Dict[str, threading.Thread] = {}  # serial -> stdout reader thread
+_cohn_ffmpeg_feeds: Dict[str, queue.Queue] = {}  # serial -> packets for that transcoder's stdin writer
+_FFMPEG_FEED_SIZE = 256  # ~0.3 MB of MPEG-TS; oldest packets are dropped past this
+_FFMPEG_WRITE_MAX = 64 * 1024  # Coalesce queued packets into writes of up to this size
 _COHN_UDP_PORT = 8554
+
+# Shared HTTPS client for COHN camera control: pooled keep-alive connections avoid
+# a TLS handshake per request (cameras use self-signed certs, hence verify=False)
+_COHN_HTTP = httpx.AsyncClient(
+    verify=False,
+    timeout=15.0,
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+)
 _udp_thread: Optional[threading.Thread] = None
 _udp_running = False
 
 # WebSocket connections for real-time updates
-websocket_connections: List[WebSocket] = []
+# Each client gets an outbound queue drained by its own relay task, so broadcasts never await sends
+websocket_connections: Dict[WebSocket, asyncio.Queue] = {}
+_WS_QUEUE_SIZE = 256  # Per-client backlog; oldest messages are dropped beyond this
+# Topic filtering (opt-in): a client that sends {"subscribe": "download.<serial>"} only gets
+# topic messages (e.g. per-chunk download progress) for topics it subscribed to.
+# Clients that never subscribe keep receiving everything.
+_ws_topics: Dict[WebSocket, Set[str]] = {}
 
 # Background task control
-background_monitor_task = None
+_monitor_tasks: List[asyncio.Task] = []  # connection_monitor + periodic pollers
 monitor_running = False
+_MONITOR_IDLE_S = 5.0  # connection_monitor poll interval while no cameras are configured
+_CONNECTION_DEBOUNCE_S = 1.0  # A BLE state change must hold this long before it's broadcast
+# Set when a camera is added so an idle monitor resumes at once. Created in startup_event:
+# on Python 3.9 asyncio primitives bind to the loop current at construction, not the serving loop
+_monitor_wake: Optional[asyncio.Event] = None
+_previous_cohn_online: Dict[str, bool] = {}  # Last COHN online state reported to clients
 
 # Cached health data from background monitor
 _cached_health_data = {}
 
+# COHN online map kept current by cohn_online_refresher (serial -> reachable)
+_cohn_online_cache: Dict[str, bool] = {}
+_COHN_ONLINE_REFRESH_S = 5.0  # probe cadence; IP recovery is throttled in cohn_manager
+
 
 # ============== Models ==============
 
@@ -162,190 +236,150 @@ class SelectedDownloadModel(BaseModel):
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    websocket_connections.append(websocket)
+    out_queue: asyncio.Queue = asyncio.Queue(maxsize=_WS_QUEUE_SIZE)
+    relay = asyncio.create_task(_websocket_relay(websocket, out_queue))
+    websocket_connections[websocket] = out_queue
+    try:
+        # Keep connection alive; iter_text() ends cleanly on disconnect
+        async for text in websocket.iter_text():
+            _handle_client_message(websocket, text)
+    finally:
+        websocket_connections.pop(websocket, None)
+        _ws_topics.pop(websocket, None)
+        relay.cancel()
+
+
+def _handle_client_message(websocket: WebSocket, text: str):
+    """Apply {"subscribe": topic} / {"unsubscribe": topic} requests; anything else is ignored"""
+    try:
+        request = _json_loads(text)
+    except ValueError:
+        return
+    if not isinstance(request, dict):
+        return
+    topic = request.get("subscribe")
+    if isinstance(topic, str):
+        _ws_topics.setdefault(websocket, set()).add(topic)
+    topic = request.get("unsubscribe")
+    if isinstance(topic, str) and websocket in _ws_topics:
+        _ws_topics[websocket].discard(topic)
+
+
+async def _websocket_relay(websocket: WebSocket, out_queue: asyncio.Queue):
+    """Send queued broadcast payloads to one client, in order"""
     try:
         while True:
-            # Keep connection alive
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        websocket_connections.remove(websocket)
+            await websocket.send_text(await out_queue.get())
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # Closed/broken socket — stop queueing for it
+        websocket_connections.pop(websocket, None)
 
 
-async def broadcast_message(message: dict):
-    """Broadcast message to all connected clients"""
-    for connection in websocket_connections:
-        try:
-            await connection.send_json(message)
-        except:
-            pass
+async def broadcast_message(message: dict, topic: Optional[str] = None):
+    """Broadcast message to all connected clients (limited to `topic` subscribers if given)"""
+    _broadcast_nowait(message, topic)
+
+
+def _broadcast_nowait(message: dict, topic: Optional[str] = None):
+    """Queue a message for all connected clients without awaiting anything.
+    Event loop thread only; other threads use loop.call_soon_threadsafe(_broadcast_nowait, msg)."""
+    if websocket_connections:
+        _broadcast_text(_json_text(message), topic)  # Encode once, not once per client
+
+
+def _broadcast_text(payload: str, topic: Optional[str] = None):
+    """Queue an already-encoded JSON message for all connected clients"""
+    for websocket, out_queue in websocket_connections.items():
+        if topic is not None and websocket in _ws_topics and topic not in _ws_topics[websocket]:
+            continue  # Client filters topics and isn't subscribed to this one
+        if out_queue.full():
+            out_queue.get_nowait()  # Slow client: drop its oldest message
+        out_queue.put_nowait(payload)
+
+
+_connection_payloads: Dict[tuple, str] = {}  # (serial, connected) -> encoded camera_connection message
+
+
+async def broadcast_connection(serial: str, connected: bool):
+    """Broadcast a camera_connection update, reusing the encoded message per (serial, state)"""
+    key = (serial, bool(connected))
+    payload = _connection_payloads.get(key)
+    if payload is None:
+        payload = _connection_payloads[key] = _json_text(
+            {"type": "camera_connection", "serial": serial, "connected": key[1]}
+        )
+    _broadcast_text(payload)
+
+
+async def _wait_ble_idle():
+    """Hold BLE polls while shutter commands are in flight."""
+    while camera_manager.ble_busy:
+        await asyncio.sleep(0.5)
 
 
 async def connection_monitor():
-    """Background task that continuously monitors BLE connection status"""
+    """Background task that continuously monitors BLE connection status (every 0.5s).
+    Slower polls run as their own tasks: battery_poller, health_poller,
+    cohn_keep_alive_pinger and cohn_online_reporter."""
     global monitor_running
     monitor_running = True
 
-    # Track previous state
+    # Track previous (last broadcast) state, and unconfirmed changes: serial -> (state, first seen)
     previous_states = {}
-    battery_poll_counter = 0
-    health_poll_counter = 0
-    cohn_poll_counter = 0
-    keep_alive_counter = 0
-    ble_probe_counter = 0
-    previous_cohn_online = {}
-
-    # Persistent HTTP client for lightweight keep-alive pings
-    keep_alive_client = httpx.AsyncClient(verify=False, timeout=2.0)
+    pending_states = {}
 
     logger.info("🔄 Connection monitor started - checking every 0.5 seconds")
 
     while monitor_running:
         try:
+            # Nothing to watch: back off until a camera is added (or the idle timeout)
+            if not camera_manager.cameras:
+                _monitor_wake.clear()
+                try:
+                    await asyncio.wait_for(_monitor_wake.wait(), _MONITOR_IDLE_S)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Snapshot the cameras: add/remove handlers may mutate the dict while we await
+            cameras = list(camera_manager.cameras.items())
+            prev_get = previous_states.get
+            changed = []
+            now = asyncio.get_running_loop().time()
+
             # Check connection status for all cameras
-            for serial, camera in camera_manager.cameras.items():
+            for serial, camera in cameras:
                 # Get current actual status
                 current_connected = camera.update_connection_status()
-
-                # Check if status changed
-                previous_connected = previous_states.get(serial, None)
-
-                if previous_connected is None:
-                    # First time seeing this camera, just store state
-                    previous_states[serial] = current_connected
-                elif previous_connected != current_connected:
-                    # Status changed! Broadcast update
-                    logger.info(f"📡 INSTANT: Connection status changed for {serial}: {previous_connected} → {current_connected}")
-
-                    await broadcast_message({
-                        "type": "camera_connection",
-                        "serial": serial,
-                        "connected": current_connected
-                    })
-
-                    # Update previous state
-                    previous_states[serial] = current_connected
-
-            # Skip all BLE polling while shutter commands are in flight
-            if not camera_manager.ble_busy:
-                # Poll battery every 60 seconds (120 iterations * 0.5s = 60s)
-                battery_poll_counter += 1
-                if battery_poll_counter >= 120:
-                    battery_poll_counter = 0
-                    try:
-                        battery_levels = await camera_manager.get_all_battery_levels()
-                        if any(v is not None for v in battery_levels.values()):
-                            await broadcast_message({
-                                "type": "battery_update",
-                                "levels": battery_levels
-                            })
-                    except Exception as e:
-                        logger.debug(f"Battery poll error: {e}")
-
-                # Broadcast health data every 15 seconds (30 iterations * 0.5s = 15s)
-                health_poll_counter += 1
-                if health_poll_counter >= 30:
-                    health_poll_counter = 0
-                    try:
-                        # 1) BLE health for BLE-connected cameras
-                        health_data = await camera_manager.get_all_health()
-
-                        # 2) COHN health for network-connected cameras (fills gaps BLE can't reach)
-                        if cohn_manager.credentials:
-                            all_creds = cohn_manager.get_all_credentials()
-                            for serial, creds in all_creds.items():
-                                # Skip if BLE already gave us good data (has battery + storage)
-                                ble_health = health_data.get(serial, {})
-                                if ble_health.get("battery_percent") is not None and ble_health.get("storage_remaining_kb") is not None:
-                                    continue
-                                ip = creds.get("ip_address")
-                                if not ip:
-                                    continue
-                                auth = cohn_manager.get_auth_header(serial)
-                                try:
-                                    state = await _cohn_get_state(ip, auth)
-                                    if "error" not in state:
-                                        cam_name = ble_health.get("name") or serial
-                                        cohn_health = _parse_cohn_state_to_health(serial, cam_name, state)
-                                        health_data[serial] = cohn_health
-                                        logger.debug(f"[{serial}] COHN health: batt={cohn_health.get('battery_percent')}% storage={cohn_health.get('storage_remaining_kb')}KB")
-                                except Exception as e:
-                                    logger.debug(f"[{serial}] COHN health query failed: {e}")
-
-                        _cached_health_data.update(health_data)
-                        # Log health values for debugging
-                        for serial, hd in health_data.items():
-                            storage = hd.get("storage_remaining_kb")
-                            battery = hd.get("battery_percent")
-                            if storage is not None or battery is not None:
-                                src = hd.get("source", "ble")
-                                logger.info(f"[{serial}] Health ({src}): battery={battery}%, storage={storage}KB")
-                        if websocket_connections:
-                            await broadcast_message({
-                                "type": "health_update",
-                                "cameras": health_data
-                            })
-                    except Exception as e:
-                        logger.debug(f"Health poll error: {e}")
-
-            # Dedicated keep-alive every 3 seconds (6 * 0.5s) — lightweight ping only
-            keep_alive_counter += 1
-            if keep_alive_counter >= 6:
-                keep_alive_counter = 0
-                if previous_cohn_online:
-                    async def _ping_keep_alive(serial: str) -> None:
-                        creds = cohn_manager.get_credentials(serial)
-                        if not creds:
-                            return
-                        ip = creds.get("ip_address")
-                        auth = cohn_manager.get_auth_header(serial)
-                        try:
-                            await keep_alive_client.get(
-                                f"https://{ip}/gopro/camera/keep_alive",
-                                headers={"Authorization": auth} if auth else {}
-                            )
-                        except Exception:
-                            pass
-
-                    online_serials = [s for s, ok in previous_cohn_online.items() if ok]
-                    if online_serials:
-                        await asyncio.gather(
-                            *[_ping_keep_alive(s) for s in online_serials],
-                            return_exceptions=True
-                        )
-
-            # Poll COHN cameras every 30 seconds (60 * 0.5s) - full state check + IP recovery
-            cohn_poll_counter += 1
-            if cohn_poll_counter >= 60:
-                cohn_poll_counter = 0
-                if cohn_manager.credentials:
-                    try:
-                        cohn_online = await cohn_manager.check_all_cameras()
-                        for serial, online in cohn_online.items():
-                            prev = previous_cohn_online.get(serial)
-                            if prev is None or prev != online:
-                                previous_cohn_online[serial] = online
-                                if websocket_connections:
-                                    await broadcast_message({
-                                        "type": "cohn_camera_online" if online else "cohn_camera_offline",
-                                        "serial": serial,
-                                        "online": online
-                                    })
-                                # Camera came online — enforce Auto Power Down = NEVER
-                                if online and prev is not True:
-                                    creds = cohn_manager.get_credentials(serial)
-                                    if creds:
-                                        ip = creds.get("ip_address")
-                                        auth = cohn_manager.get_auth_header(serial)
-                                        try:
-                                            resp = await keep_alive_client.get(
-                                                f"https://{ip}/gopro/camera/setting?setting=59&option=0",
-                                                headers={"Authorization": auth} if auth else {}
-                                            )
-                                            logger.info(f"[{serial}] Auto Power Down set to NEVER on reconnect: HTTP {resp.status_code}")
-                                        except Exception as e:
-                                            logger.debug(f"[{serial}] Failed to set Auto Power Down on reconnect: {e}")
-                    except Exception as e:
-                        logger.debug(f"COHN poll error: {e}")
+                previous_connected = prev_get(serial)
+                if previous_connected == current_connected:
+                    if pending_states:
+                        pending_states.pop(serial, None)  # Flap reverted before it settled
+                    continue
+
+                if previous_connected is not None:
+                    # Debounce: only broadcast once the new state has been stable for a while
+                    pending = pending_states.get(serial)
+                    if pending is None or pending[0] != current_connected:
+                        pending_states[serial] = (current_connected, now)
+                        continue
+                    if now - pending[1] < _CONNECTION_DEBOUNCE_S:
+                        continue
+                    del pending_states[serial]
+
+                # First sighting just records state; a settled transition is broadcast
+                previous_states[serial] = current_connected
+                if previous_connected is not None:
+                    logger.info(f"📡 Connection status changed for {serial}: {previous_connected} → {current_connected}")
+                    changed.append((serial, current_connected))
+
+            if changed:
+                await asyncio.gather(*(
+                    broadcast_connection(serial, current_connected)
+                    for serial, current_connected in changed
+                ))
 
             # Active BLE probes disabled — they send keep_alive BLE commands that
             # timeout due to response handling issues with multiple cameras sharing
@@ -360,20 +394,150 @@ async def connection_monitor():
             logger.error(f"Connection monitor error: {e}")
             await asyncio.sleep(0.5)
 
-    await keep_alive_client.aclose()
     logger.info("🛑 Connection monitor stopped")
 
 
+async def battery_poller():
+    """Background task: poll BLE battery levels every 60 seconds while a UI is connected"""
+    while monitor_running:
+        await asyncio.sleep(60)
+        if not websocket_connections:
+            continue  # Nobody to show it to — save the BLE airtime
+        await _wait_ble_idle()
+        try:
+            battery_levels = await camera_manager.get_all_battery_levels()
+            if any(v is not None for v in battery_levels.values()):
+                await broadcast_message({
+                    "type": "battery_update",
+                    "levels": battery_levels
+                })
+        except Exception as e:
+            logger.debug(f"Battery poll error: {e}")
+
+
+async def health_poller():
+    """Background task: refresh and broadcast camera health every 15 seconds"""
+    while monitor_running:
+        await asyncio.sleep(15)
+        await _wait_ble_idle()
+        try:
+            # 1) BLE health for BLE-connected cameras
+            health_data = await camera_manager.get_all_health()
+
+            # 2) COHN health for network-connected cameras (fills gaps BLE can't reach)
+            if cohn_manager.credentials:
+                all_creds = cohn_manager.get_all_credentials()
+                pending = {}
+                for serial, creds in all_creds.items():
+                    # Skip if BLE already gave us good data (has battery + storage)
+                    ble_health = health_data.get(serial, {})
+                    if ble_health.get("battery_percent") is not None and ble_health.get("storage_remaining_kb") is not None:
+                        continue
+                    ip = creds.get("ip_address")
+                    if not ip:
+                        continue
+                    pending[serial] = _cohn_get_state(ip, cohn_manager.get_auth_header(serial))
+
+                # Query all cameras at once over the shared pooled client
+                states = await asyncio.gather(*pending.values(), return_exceptions=True)
+                for serial, state in zip(pending, states):
+                    if isinstance(state, Exception):
+                        logger.debug(f"[{serial}] COHN health query failed: {state}")
+                        continue
+                    if "error" not in state:
+                        cam_name = health_data.get(serial, {}).get("name") or serial
+                        cohn_health = _parse_cohn_state_to_health(serial, cam_name, state)
+                        health_data[serial] = cohn_health
+                        logger.debug(f"[{serial}] COHN health: batt={cohn_health.get('battery_percent')}% storage={cohn_health.get('storage_remaining_kb')}KB")
+
+            _cached_health_data.update(health_data)
+            # Log health values for debugging
+            for serial, hd in health_data.items():
+                storage = hd.get("storage_remaining_kb")
+                battery = hd.get("battery_percent")
+                if storage is not None or battery is not None:
+                    src = hd.get("source", "ble")
+                    logger.info(f"[{serial}] Health ({src}): battery={battery}%, storage={storage}KB")
+            if websocket_connections:
+                await broadcast_message({
+                    "type": "health_update",
+                    "cameras": health_data
+                })
+        except Exception as e:
+            logger.debug(f"Health poll error: {e}")
+
+
+async def cohn_keep_alive_pinger():
+    """Background task: lightweight keep-alive ping to online COHN cameras every 3 seconds"""
+
+    async def _ping_keep_alive(serial: str) -> None:
+        creds = cohn_manager.get_credentials(serial)
+        if not creds:
+            return
+        try:
+            await _cohn_http_get(
+                creds.get("ip_address"), cohn_manager.get_auth_header(serial),
+                "/gopro/camera/keep_alive", timeout=2.0
+            )
+        except Exception:
+            pass
+
+    while monitor_running:
+        await asyncio.sleep(3)
+        online_serials = [s for s, ok in _previous_cohn_online.items() if ok]
+        if online_serials:
+            await asyncio.gather(
+                *[_ping_keep_alive(s) for s in online_serials],
+                return_exceptions=True
+            )
+
+
+async def cohn_online_reporter():
+    """Background task: report COHN online changes every 30 seconds.
+    Probing and IP recovery happen in cohn_online_refresher."""
+    while monitor_running:
+        await asyncio.sleep(30)
+        if not cohn_manager.credentials:
+            continue
+        try:
+            cohn_online = dict(_cohn_online_cache)
+            for serial, online in cohn_online.items():
+                prev = _previous_cohn_online.get(serial)
+                if prev is None or prev != online:
+                    _previous_cohn_online[serial] = online
+                    if websocket_connections:
+                        await broadcast_message({
+                            "type": "cohn_camera_online" if online else "cohn_camera_offline",
+                            "serial": serial,
+                            "online": online
+                        })
+                    # Camera came online — enforce Auto Power Down = NEVER
+                    if online and prev is not True:
+                        creds = cohn_manager.get_credentials(serial)
+                        if creds:
+                            ip = creds.get("ip_address")
+                            auth = cohn_manager.get_auth_header(serial)
+                            try:
+                                resp = await _cohn_http_get(
+                                    ip, auth, "/gopro/camera/setting?setting=59&option=0", timeout=2.0
+                                )
+                                logger.info(f"[{serial}] Auto Power Down set to NEVER on reconnect: HTTP {resp.status_code}")
+                            except Exception as e:
+                                logger.debug(f"[{serial}] Failed to set Auto Power Down on reconnect: {e}")
+        except Exception as e:
+            logger.debug(f"COHN poll error: {e}")
+
+
 async def auto_detect_connections():
     """Background task to auto-detect existing BLE connections on startup"""
     # Wait a bit for everything to initialize
     await asyncio.sleep(3)
 
     if len(camera_manager.cameras) > 0:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("🔍 AUTO-DETECTING existing BLE connections...")
         logger.info(f"Checking {len(camera_manager.cameras)} camera(s)...")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         try:
             # Check for existing connections
@@ -387,33 +551,25 @@ async def auto_detect_connections():
                 # Broadcast to all connected frontends
                 for serial, connected in results.items():
                     if connected:
-                        await broadcast_message({
-                            "type": "camera_connection",
-                            "serial": serial,
-                            "connected": True
-                        })
+                        await broadcast_connection(serial, True)
                         logger.info(f"   📡 {serial}: Connected!")
             else:
                 logger.info("No existing connections found")
 
-            logger.info("=" * 60)
+            logger.info(_BAR)
         except Exception as e:
             logger.error(f"Auto-detection failed: {e}")
 
 
 async def load_saved_cameras():
     """Load cameras from saved_cameras.json on startup"""
-    import json
-    from pathlib import Path
-
     saved_cameras_file = Path(__file__).parent.parent / "saved_cameras.json"
 
     if saved_cameras_file.exists():
         try:
             logger.info("📁 Loading saved cameras from saved_cameras.json...")
 
-            with open(saved_cameras_file, 'r') as f:
-                data = json.load(f)
+            data = _json_loads(await asyncio.to_thread(saved_cameras_file.read_bytes))
 
             cameras = data.get("cameras", [])
 
@@ -444,20 +600,46 @@ async def load_saved_cameras():
         logger.info("Cameras will need to be added manually via the UI or add_saved_cameras.py")
 
 
-@app.on_event("startup")
+async def cohn_online_refresher():
+    """Background task that keeps _cohn_online_cache current (probe + IP recovery)"""
+    while True:
+        try:
+            online = await cohn_manager.check_all_cameras() if cohn_manager.credentials else {}
+            _cohn_online_cache.clear()
+            _cohn_online_cache.update(online)
+        except Exception as e:
+            logger.debug(f"COHN online refresh error: {e}")
+        await asyncio.sleep(_COHN_ONLINE_REFRESH_S)
+
+
+async def _get_cohn_online(fresh: bool = False) -> Dict[str, bool]:
+    """Online map for the active network's COHN cameras, served from the refresher cache.
+    Probes live when fresh=True or when a camera hasn't been checked yet."""
+    if fresh or any(serial not in _cohn_online_cache for serial in cohn_manager.credentials):
+        _cohn_online_cache.update(await cohn_manager.check_all_cameras())
+    return {serial: _cohn_online_cache.get(serial, False) for serial in cohn_manager.credentials}
+
+
 async def startup_event():
     """Start background tasks on startup"""
-    global background_monitor_task
+    global monitor_running, _monitor_wake
 
-    logger.info("=" * 60)
+    logger.info(_BAR)
     logger.info("🚀 Starting GoPro Desktop App Backend")
-    logger.info("=" * 60)
+    logger.info(_BAR)
 
     # STEP 1: Load saved cameras from JSON file
     await load_saved_cameras()
 
-    # STEP 2: Start connection monitor
-    background_monitor_task = asyncio.create_task(connection_monitor())
+    # STEP 2: Start connection monitor and periodic pollers (each on its own cadence)
+    _monitor_wake = asyncio.Event()
+    monitor_running = True
+    _monitor_tasks.extend(
+        asyncio.create_task(coro()) for coro in (
+            connection_monitor, battery_poller, health_poller,
+            cohn_keep_alive_pinger, cohn_online_reporter, cohn_online_refresher,
+        )
+    )
     logger.info("✅ Background connection monitor started")
 
     # STEP 3: Skip auto-detect on startup (blocks event loop with BLE scanning)
@@ -465,23 +647,24 @@ async def startup_event():
     logger.info("ℹ️  Auto-detection disabled on startup — use Connect buttons in UI")
 
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown"""
-    global monitor_running, background_monitor_task
+    global monitor_running
 
-    logger.info("=" * 60)
+    logger.info(_BAR)
     logger.info("🛑 Shutting down GoPro Desktop App Backend")
-    logger.info("=" * 60)
+    logger.info(_BAR)
 
     # Stop monitor
     monitor_running = False
-    if background_monitor_task:
-        background_monitor_task.cancel()
-        try:
-            await background_monitor_task
-        except asyncio.CancelledError:
-            pass
+    for task in _monitor_tasks:
+        task.cancel()
+    await asyncio.gather(*_monitor_tasks, return_exceptions=True)
+    _monitor_tasks.clear()
+
+    await _COHN_HTTP.aclose()
+    _WIFI_POOL.shutdown(wait=False)
+    _SD_POOL.shutdown(wait=False)
 
     logger.info("✅ Background tasks stopped")
 
@@ -504,6 +687,8 @@ async def add_camera(camera: CameraModel):
         camera.name
     )
     if success:
+        if _monitor_wake is not None:
+            _monitor_wake.set()
         await broadcast_message({"type": "camera_added", "camera": camera.dict()})
         return {"success": True, "message": "Camera added"}
     else:
@@ -546,7 +731,7 @@ async def discover_cameras(timeout: int = 30):
 async def connect_all_cameras():
     """Connect to all cameras via BLE - checks existing connections FIRST for instant detection"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("Starting BLE connection to all cameras...")
         logger.info(f"Total cameras to connect: {len(camera_manager.cameras)}")
 
@@ -557,7 +742,7 @@ async def connect_all_cameras():
             logger.warning("No cameras configured!")
             raise HTTPException(status_code=400, detail="No cameras configured. Add cameras first.")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # STEP 1: FIRST check for existing macOS Bluetooth connections (INSTANT!)
         logger.info("STEP 1: Checking for existing macOS Bluetooth connections...")
@@ -567,32 +752,26 @@ async def connect_all_cameras():
         logger.info(f"✅ Found {connected_count} existing connection(s)")
 
         # Broadcast updates for cameras that are already connected
-        for serial, connected in existing_results.items():
-            if connected:
-                await broadcast_message({
-                    "type": "camera_connection",
-                    "serial": serial,
-                    "connected": True
-                })
+        await asyncio.gather(*(
+            broadcast_connection(serial, True)
+            for serial, connected in existing_results.items() if connected
+        ))
 
         # STEP 2: Connect to remaining cameras that weren't already connected
         logger.info("STEP 2: Connecting to remaining cameras...")
         results = await camera_manager.connect_all()
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("BLE Connection Results:")
         for serial, success in results.items():
             status = "✅ SUCCESS" if success else "❌ FAILED"
             logger.info(f"  {serial}: {status}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # Broadcast status updates
-        for serial, success in results.items():
-            await broadcast_message({
-                "type": "camera_connection",
-                "serial": serial,
-                "connected": success
-            })
+        await asyncio.gather(*(
+            broadcast_connection(serial, success) for serial, success in results.items()
+        ))
 
         success_count = sum(1 for s in results.values() if s)
         total_count = len(results)
@@ -622,11 +801,7 @@ async def connect_single_camera(serial: str):
         logger.info(f"Connecting single camera: {serial}")
         success = await camera.connect_ble()
 
-        await broadcast_message({
-            "type": "camera_connection",
-            "serial": serial,
-            "connected": success
-        })
+        await broadcast_connection(serial, success)
 
         return {"success": success, "serial": serial, "connected": success}
     except HTTPException:
@@ -658,11 +833,7 @@ async def disconnect_single_camera(serial: str):
 
         await camera.disconnect()
 
-        await broadcast_message({
-            "type": "camera_connection",
-            "serial": serial,
-            "connected": False
-        })
+        await broadcast_connection(serial, False)
 
         return {
             "success": True,
@@ -686,11 +857,7 @@ async def check_existing_connections():
         # Broadcast updates for any cameras that were reconnected
         for serial, connected in results.items():
             if connected:
-                await broadcast_message({
-                    "type": "camera_connection",
-                    "serial": serial,
-                    "connected": True
-                })
+                await broadcast_connection(serial, True)
 
         connected_count = sum(1 for c in results.values() if c)
 
@@ -722,7 +889,7 @@ async def get_battery_levels():
 async def start_recording():
     """Start recording on all connected cameras"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("🔴 START RECORDING REQUEST")
 
         connected = [cam for cam in camera_manager.cameras.values() if cam.connected]
@@ -735,24 +902,19 @@ async def start_recording():
         for cam in connected:
             logger.info(f"  - {cam.serial}: ready to record")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         results = await camera_manager.start_recording_all()
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("Recording Start Results:")
         for serial, success in results.items():
             status = "✅ RECORDING" if success else "❌ FAILED"
             logger.info(f"  {serial}: {status}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
-        # Broadcast updates
-        for serial, success in results.items():
-            await broadcast_message({
-                "type": "recording_started",
-                "serial": serial,
-                "success": success
-            })
+        # Broadcast updates (one message for all cameras: serial -> success)
+        await broadcast_message({"type": "recording_started", "results": results})
 
         success_count = sum(1 for s in results.values() if s)
         logger.info(f"Final: {success_count}/{len(results)} cameras recording")
@@ -790,7 +952,7 @@ async def start_recording():
 async def stop_recording():
     """Stop recording on all cameras"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("⏹️  STOP RECORDING REQUEST")
 
         recording = [cam for cam in camera_manager.cameras.values() if cam.recording]
@@ -802,24 +964,19 @@ async def stop_recording():
         for cam in recording:
             logger.info(f"  - {cam.serial}: stopping...")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         results = await camera_manager.stop_recording_all()
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("Recording Stop Results:")
         for serial, success in results.items():
             status = "✅ STOPPED" if success else "❌ FAILED"
             logger.info(f"  {serial}: {status}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
-        # Broadcast updates
-        for serial, success in results.items():
-            await broadcast_message({
-                "type": "recording_stopped",
-                "serial": serial,
-                "success": success
-            })
+        # Broadcast updates (one message for all cameras: serial -> success)
+        await broadcast_message({"type": "recording_stopped", "results": results})
 
         success_count = sum(1 for s in results.values() if s)
         logger.info(f"Final: {success_count}/{len(results)} cameras stopped")
@@ -1008,7 +1165,7 @@ async def delete_take(shoot_id: str, take_number: int):
 async def start_preview():
     """Start live preview/webcam mode on all connected cameras"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("📹 START PREVIEW REQUEST")
 
         connected = [cam for cam in camera_manager.cameras.values() if cam.connected]
@@ -1021,28 +1178,30 @@ async def start_preview():
         for cam in connected:
             logger.info(f"  - {cam.serial}: starting preview...")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         results = await camera_manager.start_preview_all()
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("Preview Start Results:")
         for serial, result in results.items():
             status = "✅ STREAMING" if result.get("success") else "❌ FAILED"
             logger.info(f"  {serial}: {status}")
             if result.get("stream_url"):
                 logger.info(f"    Stream URL: {result['stream_url']}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # Broadcast updates
-        for serial, result in results.items():
-            await broadcast_message({
+        await asyncio.gather(*(
+            broadcast_message({
                 "type": "preview_started",
                 "serial": serial,
                 "success": result.get("success"),
                 "stream_url": result.get("stream_url"),
                 "preview_url": result.get("preview_url")
             })
+            for serial, result in results.items()
+        ))
 
         success_count = sum(1 for r in results.values() if r.get("success"))
         logger.info(f"Final: {success_count}/{len(results)} cameras streaming")
@@ -1063,7 +1222,7 @@ async def start_preview():
 async def start_preview_single(serial: str):
     """Start live preview on a specific camera"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"📹 START PREVIEW REQUEST for camera {serial}")
 
         camera = camera_manager.get_camera(serial)
@@ -1080,7 +1239,7 @@ async def start_preview_single(serial: str):
         logger.info(f"Preview result: {status}")
         if result.get("stream_url"):
             logger.info(f"Stream URL: {result['stream_url']}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # Broadcast update
         await broadcast_message({
@@ -1109,14 +1268,9 @@ async def start_preview_single(serial: str):
 @app.post("/api/preview/stream-start")
 async def start_camera_stream():
     """Tell GoPro to start UDP/HLS stream (must be on camera WiFi)"""
-    import requests as sync_requests
     try:
         logger.info("📹 Starting camera stream via HTTP...")
-        loop = asyncio.get_event_loop()
-        resp = await loop.run_in_executor(
-            None,
-            lambda: sync_requests.get("http://10.5.5.9:8080/gopro/camera/stream/start", timeout=10)
-        )
+        resp = await _COHN_HTTP.get("http://10.5.5.9:8080/gopro/camera/stream/start", timeout=10.0)
         logger.info(f"Stream start response: {resp.status_code}")
         return {"success": resp.status_code == 200, "status_code": resp.status_code}
     except Exception as e:
@@ -1128,7 +1282,7 @@ async def start_camera_stream():
 async def stop_preview_single(serial: str):
     """Stop live preview on a specific camera"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"⏹️  STOP PREVIEW REQUEST for camera {serial}")
 
         camera = camera_manager.get_camera(serial)
@@ -1139,7 +1293,7 @@ async def stop_preview_single(serial: str):
 
         status = "✅ STOPPED" if success else "❌ FAILED"
         logger.info(f"Preview stop result: {status}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # Broadcast update
         await broadcast_message({
@@ -1163,25 +1317,27 @@ async def stop_preview_single(serial: str):
 async def stop_preview():
     """Stop live preview/webcam mode on all cameras"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("⏹️  STOP PREVIEW REQUEST")
 
         results = await camera_manager.stop_preview_all()
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("Preview Stop Results:")
         for serial, success in results.items():
             status = "✅ STOPPED" if success else "❌ FAILED"
             logger.info(f"  {serial}: {status}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # Broadcast updates
-        for serial, success in results.items():
-            await broadcast_message({
+        await asyncio.gather(*(
+            broadcast_message({
                 "type": "preview_stopped",
                 "serial": serial,
                 "success": success
             })
+            for serial, success in results.items()
+        ))
 
         success_count = sum(1 for s in results.values() if s)
         logger.info(f"Final: {success_count}/{len(results)} cameras stopped")
@@ -1200,12 +1356,31 @@ async def stop_preview():
 
 # ============== WiFi Management ==============
 
+# Read-only probes use wifi_manager's async_* methods (child processes awaited on the loop).
+# connect_wifi/disconnect are multi-step with sleeps and can block for seconds; they get
+# their own threads so downloads don't queue behind other executor work (and vice versa)
+_WIFI_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wifi")
+
+
+async def _wifi_call(fn, *args):
+    """Run a blocking wifi_manager call on the WiFi thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(_WIFI_POOL, fn, *args)
+
+
+# Camera SD-card scans/erase over WiFi direct (blocking HTTP, an erase can take many
+# seconds); kept off the default executor so file I/O offloads never wait behind them
+_SD_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sd")
+
+
+async def _sd_call(fn, *args):
+    """Run a blocking camera media/SD call on the SD thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(_SD_POOL, fn, *args)
+
+
 @app.get("/api/wifi/current")
 async def get_current_wifi():
     """Get current WiFi status — works on macOS 26+ where SSID is hidden"""
-    ssid = wifi_manager.get_current_wifi()
-    ip = wifi_manager.get_current_ip()
-    on_gopro = wifi_manager.is_on_gopro_network()
+    ssid, ip, on_gopro = await wifi_manager.async_snapshot()
 
     # Determine network type for frontend display
     if on_gopro:
@@ -1231,7 +1406,7 @@ async def get_current_wifi():
 async def connect_wifi(connection: WiFiConnectionModel):
     """Connect to a WiFi network"""
     try:
-        success = wifi_manager.connect_wifi(connection.ssid, connection.password)
+        success = await _wifi_call(wifi_manager.connect_wifi, connection.ssid, connection.password)
         return {"success": success}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1244,9 +1419,7 @@ async def connect_camera_wifi(serial: str):
     if not camera:
         raise HTTPException(status_code=404, detail=f"Camera {serial} not found")
     try:
-        loop = asyncio.get_event_loop()
-        success = await loop.run_in_executor(
-            None,
+        success = await _wifi_call(
             wifi_manager.connect_wifi,
             camera.wifi_ssid,
             camera.wifi_password
@@ -1260,7 +1433,7 @@ async def connect_camera_wifi(serial: str):
 async def enable_wifi_all():
     """Enable WiFi on all cameras"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("📡 ENABLE WiFi REQUEST")
 
         connected = [cam for cam in camera_manager.cameras.values() if cam.connected]
@@ -1273,16 +1446,16 @@ async def enable_wifi_all():
         for cam in connected:
             logger.info(f"  - {cam.serial}: enabling WiFi...")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         results = await camera_manager.enable_wifi_all()
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("WiFi Enable Results:")
         for serial, success in results.items():
             status = "✅ SUCCESS" if success else "❌ FAILED"
             logger.info(f"  {serial}: {status}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         success_count = sum(1 for s in results.values() if s)
         logger.info(f"Final: {success_count}/{len(results)} cameras have WiFi enabled")
@@ -1299,15 +1472,11 @@ async def enable_wifi_all():
 async def disconnect_wifi():
     """Disconnect from current WiFi"""
     try:
-        current = wifi_manager.get_current_wifi()
+        current = await wifi_manager.async_get_current_wifi()
         logger.info(f"Disconnecting from WiFi: {current}")
 
-        # Run blocking disconnect in thread pool
-        loop = asyncio.get_event_loop()
-        success = await loop.run_in_executor(
-            None,
-            wifi_manager.disconnect
-        )
+        # Run blocking disconnect in the WiFi thread pool
+        success = await _wifi_call(wifi_manager.disconnect)
 
         if success:
             logger.info("✅ Disconnected successfully")
@@ -1324,6 +1493,157 @@ async def disconnect_wifi():
 
 # ============== Download Management ==============
 
+_PROGRESS_MIN_INTERVAL_S = 0.1  # At most one download_progress per file per interval
+
+
+def _progress_gate():
+    """Filter for per-chunk download progress (downloaders report every 8 KB): passes a
+    file's first report, 100%, and percent changes at most once per interval"""
+    last = {"filename": None, "percent": -1, "t": 0.0}
+
+    def should_emit(filename: str, percent: int) -> bool:
+        now = time.monotonic()
+        if filename == last["filename"]:
+            if percent == last["percent"]:
+                return False
+            if percent != 100 and now - last["t"] < _PROGRESS_MIN_INTERVAL_S:
+                return False
+        last["filename"], last["percent"], last["t"] = filename, percent, now
+        return True
+
+    return should_emit
+
+
+def _progress_message(serial: str, filename: str, current: int, total: int, percent: int) -> dict:
+    return {
+        "type": "download_progress",
+        "serial": serial,
+        "filename": filename,
+        "current_file": current,
+        "total_files": total,
+        "percent": percent
+    }
+
+
+def _download_progress_callback(serial: str, loop: asyncio.AbstractEventLoop):
+    """Throttled progress callback for the sync (thread pool) WiFi-direct downloaders"""
+    should_emit = _progress_gate()
+
+    def progress_callback(filename: str, current: int, total: int, percent: int):
+        if not should_emit(filename, percent):
+            return
+        # Hand the message to the event loop thread (no coroutine/Future per update)
+        try:
+            loop.call_soon_threadsafe(
+                _broadcast_nowait, _progress_message(serial, filename, current, total, percent),
+                f"download.{serial}"
+            )
+        except Exception as e:
+            logger.warning(f"Could not broadcast progress: {e}")
+
+    return progress_callback
+
+
+def _cohn_progress_callback(serial: str):
+    """Throttled progress callback for the async COHN downloaders"""
+    should_emit = _progress_gate()
+
+    async def progress_callback(filename: str, current: int, total: int, percent: int):
+        if should_emit(filename, percent):
+            await broadcast_message(
+                _progress_message(serial, filename, current, total, percent), topic=f"download.{serial}"
+            )
+
+    return progress_callback
+
+
+async def _wait_for_home_wifi(timeout: float = 20.0) -> Optional[str]:
+    """After leaving camera WiFi, wait for the OS to rejoin the home network.
+    Polls with backoff (0.1s doubling to 2s) so a fast reassociation is seen quickly.
+    Returns the new IP, or None if still not reconnected after `timeout` seconds."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.1
+    while loop.time() < deadline:
+        await asyncio.sleep(delay)
+        home_ip = await wifi_manager.async_get_home_ip()
+        if home_ip:
+            return home_ip
+        delay = min(delay * 2, 2.0)
+    return None
+
+
+@asynccontextmanager
+async def _camera_wifi_session(camera, status_type: str, error_event: Callable[[str], dict]):
+    """WiFi-direct scaffold for the download/browse handlers: enable the camera's AP over
+    BLE, join its WiFi, run the body, then rejoin home WiFi (unless we started on camera WiFi).
+    Steps are broadcast as `status_type` messages; a failed join broadcasts error_event(msg)
+    and raises a 500. Yields the original SSID."""
+    serial = camera.serial
+
+    def status(step: str, message: str) -> dict:
+        return {"type": status_type, "serial": serial, "status": step,
+                "transport": "wifi_direct", "message": message}
+
+    async def enable_ap():
+        if camera.connected and camera.gopro and camera.gopro.is_ble_connected:
+            wifi_enabled = await camera.enable_wifi()
+            if not wifi_enabled:
+                logger.warning(f"⚠️  WiFi AP enable returned False, attempting connection anyway...")
+        else:
+            logger.warning(f"⚠️  Camera {serial} not BLE-connected, attempting WiFi connection anyway...")
+
+    # Step 1: Enable WiFi AP on camera via BLE (must happen before Mac can connect).
+    # The snapshot of the current network state doesn't depend on it, so probe concurrently.
+    logger.info(f"Step 1: Enabling WiFi AP on camera {serial} via BLE...")
+    await broadcast_message(status("enabling_wifi", f"Enabling WiFi on camera {serial}..."))
+    (original_wifi, original_ip, on_gopro_already), _ = await asyncio.gather(
+        wifi_manager.async_snapshot(), enable_ap()
+    )
+    logger.info(f"📡 Original WiFi: {original_wifi or '(hidden on macOS 26)'}")
+    logger.info(f"📡 Original IP: {original_ip}")
+    logger.info(f"📡 Already on GoPro network: {on_gopro_already}")
+
+    # Step 2: Connect Mac to camera WiFi
+    logger.info(f"Step 2: Connecting to camera WiFi: {camera.wifi_ssid}")
+    await broadcast_message(status("connecting_wifi", f"Connecting to {camera.wifi_ssid}..."))
+    wifi_success = await _wifi_call(wifi_manager.connect_wifi, camera.wifi_ssid, camera.wifi_password)
+    if not wifi_success:
+        error_msg = f"Failed to connect to camera WiFi: {camera.wifi_ssid}"
+        logger.error(f"❌ {error_msg}")
+        await broadcast_message(error_event(error_msg))
+        raise HTTPException(status_code=500, detail=error_msg)
+    logger.info(f"✅ Successfully connected to {camera.wifi_ssid}")
+
+    yield original_wifi
+
+    # Reconnect to original WiFi for uploading
+    if on_gopro_already:
+        logger.info("Skipping WiFi reconnection (was already on GoPro network before download)")
+        return
+    logger.info(f"Reconnecting to home WiFi (original IP: {original_ip})...")
+    await broadcast_message(status("reconnecting_wifi", "Reconnecting to home WiFi..."))
+    await _wifi_call(wifi_manager.disconnect)
+
+    logger.info("Waiting for macOS to auto-reconnect to preferred network...")
+    current_ip = await _wait_for_home_wifi()
+    if current_ip:
+        logger.info(f"✅ Reconnected to home WiFi (IP: {current_ip})")
+        await broadcast_message(status("wifi_restored", "Reconnected to home WiFi! Ready to upload."))
+    else:
+        logger.warning("⚠️  Auto-reconnect to home WiFi timed out")
+        logger.warning("Please manually reconnect to your WiFi to upload files")
+        await broadcast_message(status("wifi_manual_needed", "Please manually reconnect to your home WiFi to upload files"))
+
+
+def _download_error_event(serial: str) -> Callable[[str], dict]:
+    return lambda error_msg: {"type": "download_error", "serial": serial, "error": error_msg}
+
+
+def _browse_error_event(serial: str) -> Callable[[str], dict]:
+    return lambda error_msg: {"type": "browse_status", "serial": serial, "status": "error", "message": error_msg}
+
+
 @app.get("/api/media/list")
 async def get_media_list(serial: Optional[str] = None):
     """Get media list from camera. Uses COHN if serial provided and COHN-provisioned."""
@@ -1390,21 +1710,11 @@ async def download_all_takes_for_shoot(shoot_id: str):
             base_url = f"https://{ip}"
             auth = cohn_manager.get_auth_header(serial)
 
-            async def progress_cb(filename, current, total, percent):
-                await broadcast_message({
-                    "type": "download_progress",
-                    "serial": serial,
-                    "filename": filename,
-                    "current_file": current,
-                    "total_files": total,
-                    "percent": percent
-                })
-
             files = await download_manager.async_download_all_from_camera(
                 serial=serial,
                 base_url=base_url,
                 auth_header=auth,
-                progress_callback=progress_cb,
+                progress_callback=_cohn_progress_callback(serial),
                 take_windows=take_windows,
             )
             return serial, len(files), None
@@ -1448,7 +1758,7 @@ async def download_all_takes_for_shoot(shoot_id: str):
 async def download_from_camera(serial: str, max_files: Optional[int] = None, shoot_name: Optional[str] = None, take_number: Optional[int] = None):
     """Download files from a camera (optionally limit to last N files). COHN-first, WiFi-direct fallback."""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         if max_files:
             logger.info(f"📥 DOWNLOAD REQUEST for camera {serial} (last {max_files} files)")
         else:
@@ -1471,15 +1781,7 @@ async def download_from_camera(serial: str, max_files: Optional[int] = None, sho
                 "message": f"Downloading from {camera.name or serial} via COHN..."
             })
 
-            async def cohn_progress(filename: str, current: int, total: int, percent: int):
-                await broadcast_message({
-                    "type": "download_progress",
-                    "serial": serial,
-                    "filename": filename,
-                    "current_file": current,
-                    "total_files": total,
-                    "percent": percent
-                })
+            cohn_progress = _cohn_progress_callback(serial)
 
             # Look up take time window for filtering
             take_start = None
@@ -1524,179 +1826,57 @@ async def download_from_camera(serial: str, max_files: Optional[int] = None, sho
                 "transport": "cohn"
             })
 
+            # Paths are stringified by FastAPI's response encoding; no shadow list needed
             return {
                 "success": True,
                 "files_count": len(downloaded_files),
-                "files": [str(f) for f in downloaded_files],
+                "files": downloaded_files,
                 "transport": "cohn"
             }
 
         # --- WiFi direct fallback (existing code) ---
         logger.info("No COHN credentials, falling back to WiFi direct")
 
-        logger.info(f"Camera Details:")
-        logger.info(f"   Name: {camera.name or serial}")
-        logger.info(f"   Serial: {camera.serial}")
-        logger.info(f"   WiFi SSID: {camera.wifi_ssid}")
-        logger.info(f"   WiFi Password: {'*' * len(camera.wifi_password)} ({len(camera.wifi_password)} chars)")
-        logger.info(f"   Connected: {camera.connected}")
-        logger.info("=" * 60)
-
-        # Save current network state before switching
-        loop = asyncio.get_event_loop()
-        original_wifi = await loop.run_in_executor(None, wifi_manager.get_current_wifi)
-        original_ip = await loop.run_in_executor(None, wifi_manager.get_current_ip)
-        on_gopro_already = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-        logger.info(f"📡 Original WiFi: {original_wifi or '(hidden on macOS 26)'}")
-        logger.info(f"📡 Original IP: {original_ip}")
-        logger.info(f"📡 Already on GoPro network: {on_gopro_already}")
-
-        # Step 1: Enable WiFi AP on camera via BLE (must happen before Mac can connect)
-        logger.info(f"Step 1: Enabling WiFi AP on camera {serial} via BLE...")
-        await broadcast_message({
-            "type": "download_status",
-            "serial": serial,
-            "status": "enabling_wifi",
-            "transport": "wifi_direct",
-            "message": f"Enabling WiFi on camera {serial}..."
-        })
-
-        if camera.connected and camera.gopro and camera.gopro.is_ble_connected:
-            wifi_enabled = await camera.enable_wifi()
-            if not wifi_enabled:
-                logger.warning(f"⚠️  WiFi AP enable returned False, attempting connection anyway...")
-        else:
-            logger.warning(f"⚠️  Camera {serial} not BLE-connected, attempting WiFi connection anyway...")
-
-        # Step 2: Connect Mac to camera WiFi
-        logger.info(f"Step 2: Connecting to camera WiFi: {camera.wifi_ssid}")
-        await broadcast_message({
-            "type": "download_status",
-            "serial": serial,
-            "status": "connecting_wifi",
-            "transport": "wifi_direct",
-            "message": f"Connecting to {camera.wifi_ssid}..."
-        })
-
-        # Run blocking WiFi connection in thread pool
-        wifi_success = await loop.run_in_executor(
-            None,
-            wifi_manager.connect_wifi,
-            camera.wifi_ssid,
-            camera.wifi_password
+        # One record per block: each logger call is a separate queued record and write
+        logger.info(
+            f"Camera Details:\n"
+            f"   Name: {camera.name or serial}\n"
+            f"   Serial: {camera.serial}\n"
+            f"   WiFi SSID: {camera.wifi_ssid}\n"
+            f"   WiFi Password: {'*' * len(camera.wifi_password)} ({len(camera.wifi_password)} chars)\n"
+            f"   Connected: {camera.connected}\n"
+            f"{_BAR}"
         )
 
-        if not wifi_success:
-            error_msg = f"Failed to connect to camera WiFi: {camera.wifi_ssid}"
-            logger.error(f"❌ {error_msg}")
-            logger.info("=" * 60)
-            await broadcast_message({
-                "type": "download_error",
-                "serial": serial,
-                "error": error_msg
-            })
-            raise HTTPException(status_code=500, detail=error_msg)
-
-        logger.info(f"✅ Successfully connected to {camera.wifi_ssid}")
-        await broadcast_message({
-            "type": "download_status",
-            "serial": serial,
-            "status": "wifi_connected",
-            "transport": "wifi_direct",
-            "message": f"Connected to {camera.wifi_ssid}, starting download..."
-        })
-
-        # Download files with progress updates
-        logger.info(f"Step 3: Fetching media list from camera...")
-
-        def progress_callback(filename: str, current: int, total: int, percent: int):
-            """Progress callback that broadcasts to WebSocket"""
-            logger.info(f"Downloading {current}/{total}: {filename} ({percent}%)")
-            # Schedule the broadcast on the main event loop from thread
-            try:
-                asyncio.run_coroutine_threadsafe(
-                    broadcast_message({
-                        "type": "download_progress",
-                        "serial": serial,
-                        "filename": filename,
-                        "current_file": current,
-                        "total_files": total,
-                        "percent": percent
-                    }),
-                    loop
-                )
-            except Exception as e:
-                logger.warning(f"Could not broadcast progress: {e}")
-
-        # Run download in thread pool
-        logger.info("Step 4: Starting file download...")
-
-        # Use partial to pass parameters
-        from functools import partial
-        download_func = partial(
-            download_manager.download_all_from_camera,
-            serial,
-            progress_callback,
-            max_files,
-            shoot_name=shoot_name,
-            take_number=take_number
-        )
-        downloaded_files = await loop.run_in_executor(None, download_func)
-
-        logger.info("=" * 60)
-        logger.info(f"✅ Download complete!")
-        logger.info(f"Downloaded {len(downloaded_files)} files from camera {serial}")
-        logger.info("Files:")
-        for f in downloaded_files:
-            logger.info(f"  - {f.name}")
-        logger.info("=" * 60)
-
-        # Step 5: Reconnect to original WiFi for uploading
-        should_reconnect = not on_gopro_already
-        if should_reconnect:
-            logger.info(f"Step 5: Reconnecting to home WiFi (original IP: {original_ip})...")
+        loop = asyncio.get_running_loop()
+        async with _camera_wifi_session(camera, "download_status", _download_error_event(serial)) as original_wifi:
             await broadcast_message({
                 "type": "download_status",
                 "serial": serial,
-                "status": "reconnecting_wifi",
+                "status": "wifi_connected",
                 "transport": "wifi_direct",
-                "message": "Reconnecting to home WiFi..."
+                "message": f"Connected to {camera.wifi_ssid}, starting download..."
             })
 
-            await loop.run_in_executor(None, wifi_manager.disconnect)
-
-            logger.info("Waiting for macOS to auto-reconnect to preferred network...")
-            reconnected = False
-            for attempt in range(10):
-                await asyncio.sleep(2)
-                current_ip = await loop.run_in_executor(None, wifi_manager.get_current_ip)
-                still_on_gopro = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
+            # Step 3: Download files in thread pool with progress updates
+            logger.info("Step 3: Starting file download...")
+            progress_callback = _download_progress_callback(serial, loop)
 
-                if current_ip and not still_on_gopro:
-                    logger.info(f"✅ Reconnected to home WiFi (IP: {current_ip})")
-                    await broadcast_message({
-                        "type": "download_status",
-                        "serial": serial,
-                        "status": "wifi_restored",
-                        "transport": "wifi_direct",
-                        "message": f"Reconnected to home WiFi! Ready to upload."
-                    })
-                    reconnected = True
-                    break
-                logger.info(f"   Waiting... attempt {attempt+1}/10 (IP: {current_ip})")
+            def download_func():
+                return download_manager.download_all_from_camera(
+                    serial, progress_callback, max_files,
+                    shoot_name=shoot_name, take_number=take_number
+                )
+            downloaded_files = await loop.run_in_executor(None, download_func)
 
-            if not reconnected:
-                logger.warning("⚠️  Auto-reconnect to home WiFi timed out")
-                logger.warning("Please manually reconnect to your WiFi to upload files")
-                await broadcast_message({
-                    "type": "download_status",
-                    "serial": serial,
-                    "status": "wifi_manual_needed",
-                    "transport": "wifi_direct",
-                    "message": "Please manually reconnect to your home WiFi to upload files"
-                })
-        else:
-            logger.info("Skipping WiFi reconnection (was already on GoPro network before download)")
+            logger.info("\n".join([
+                _BAR,
+                "✅ Download complete!",
+                f"Downloaded {len(downloaded_files)} files from camera {serial}",
+                "Files:",
+                *(f"  - {f.name}" for f in downloaded_files),
+                _BAR,
+            ]))
 
         await broadcast_message({
             "type": "download_complete",
@@ -1708,7 +1888,7 @@ async def download_from_camera(serial: str, max_files: Optional[int] = None, sho
         return {
             "success": True,
             "files_count": len(downloaded_files),
-            "files": [str(f) for f in downloaded_files],
+            "files": downloaded_files,
             "original_wifi": original_wifi,
             "transport": "wifi_direct"
         }
@@ -1717,10 +1897,7 @@ async def download_from_camera(serial: str, max_files: Optional[int] = None, sho
         raise
     except Exception as e:
         error_msg = f"Download failed: {str(e)}"
-        logger.error("=" * 60)
-        logger.error(f"❌ {error_msg}")
-        logger.error("=" * 60)
-        logger.error("Exception details:", exc_info=True)
+        logger.error(f"{_BAR}\n❌ {error_msg}\n{_BAR}\nException details:", exc_info=True)
         await broadcast_message({
             "type": "download_error",
             "serial": serial,
@@ -1733,7 +1910,7 @@ async def download_from_camera(serial: str, max_files: Optional[int] = None, sho
 async def download_latest_from_camera(serial: str, shoot_name: Optional[str] = None, take_number: Optional[int] = None):
     """Download only the latest video from a camera. COHN-first, WiFi-direct fallback."""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"DOWNLOAD LATEST VIDEO REQUEST for camera {serial}")
 
         camera = camera_manager.get_camera(serial)
@@ -1750,12 +1927,7 @@ async def download_latest_from_camera(serial: str, shoot_name: Optional[str] = N
                 "message": f"Downloading latest video from {camera.name or serial} via COHN..."
             })
 
-            async def cohn_progress(filename, current, total, percent):
-                await broadcast_message({
-                    "type": "download_progress", "serial": serial,
-                    "filename": filename, "current_file": current,
-                    "total_files": total, "percent": percent
-                })
+            cohn_progress = _cohn_progress_callback(serial)
 
             downloaded_files = await download_manager.async_download_latest_from_camera(
                 serial=serial, base_url=cohn["base_url"], auth_header=cohn["auth_header"],
@@ -1767,77 +1939,33 @@ async def download_latest_from_camera(serial: str, shoot_name: Optional[str] = N
                 "files_count": len(downloaded_files), "transport": "cohn"
             })
             return {"success": True, "files_count": len(downloaded_files),
-                    "files": [str(f) for f in downloaded_files], "transport": "cohn"}
+                    "files": downloaded_files, "transport": "cohn"}
 
         # --- WiFi direct fallback ---
         logger.info("No COHN credentials, falling back to WiFi direct")
-        loop = asyncio.get_event_loop()
-        on_gopro_already = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-
-        # Enable WiFi AP on camera via BLE
-        if camera.connected and camera.gopro and camera.gopro.is_ble_connected:
-            await camera.enable_wifi()
-
-        # Connect to camera WiFi
-        await broadcast_message({
-            "type": "download_status", "serial": serial,
-            "status": "connecting_wifi", "transport": "wifi_direct",
-            "message": f"Connecting to {camera.wifi_ssid}..."
-        })
+        loop = asyncio.get_running_loop()
+        async with _camera_wifi_session(camera, "download_status", _download_error_event(serial)):
+            await broadcast_message({
+                "type": "download_status", "serial": serial,
+                "status": "wifi_connected", "transport": "wifi_direct",
+                "message": f"Connected to {camera.wifi_ssid}, downloading latest video..."
+            })
 
-        wifi_success = await loop.run_in_executor(
-            None, wifi_manager.connect_wifi, camera.wifi_ssid, camera.wifi_password
-        )
+            progress_callback = _download_progress_callback(serial, loop)
 
-        if not wifi_success:
-            error_msg = f"Failed to connect to camera WiFi: {camera.wifi_ssid}"
-            await broadcast_message({"type": "download_error", "serial": serial, "error": error_msg})
-            raise HTTPException(status_code=500, detail=error_msg)
+            def download_func():
+                return download_manager.download_latest_from_camera(
+                    serial, progress_callback, shoot_name=shoot_name, take_number=take_number
+                )
+            downloaded_files = await loop.run_in_executor(None, download_func)
 
         await broadcast_message({
-            "type": "download_status", "serial": serial,
-            "status": "wifi_connected", "transport": "wifi_direct",
-            "message": f"Connected to {camera.wifi_ssid}, downloading latest video..."
-        })
-
-        def progress_callback(filename: str, current: int, total: int, percent: int):
-            try:
-                asyncio.run_coroutine_threadsafe(
-                    broadcast_message({
-                        "type": "download_progress", "serial": serial,
-                        "filename": filename, "current_file": current,
-                        "total_files": total, "percent": percent
-                    }),
-                    loop
-                )
-            except Exception as e:
-                logger.warning(f"Could not broadcast progress: {e}")
-
-        from functools import partial
-        download_func = partial(
-            download_manager.download_latest_from_camera,
-            serial, progress_callback,
-            shoot_name=shoot_name, take_number=take_number
-        )
-        downloaded_files = await loop.run_in_executor(None, download_func)
-
-        # Reconnect to home WiFi
-        if not on_gopro_already:
-            await loop.run_in_executor(None, wifi_manager.disconnect)
-            for attempt in range(10):
-                await asyncio.sleep(2)
-                current_ip = await loop.run_in_executor(None, wifi_manager.get_current_ip)
-                still_on_gopro = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-                if current_ip and not still_on_gopro:
-                    break
-
-        await broadcast_message({
-            "type": "download_complete", "serial": serial,
-            "files_count": len(downloaded_files), "transport": "wifi_direct"
+            "type": "download_complete", "serial": serial,
+            "files_count": len(downloaded_files), "transport": "wifi_direct"
         })
 
         return {"success": True, "files_count": len(downloaded_files),
-                "files": [str(f) for f in downloaded_files], "transport": "wifi_direct"}
+                "files": downloaded_files, "transport": "wifi_direct"}
 
     except HTTPException:
         raise
@@ -1852,14 +1980,14 @@ async def download_latest_from_camera(serial: str, shoot_name: Optional[str] = N
 async def download_selected_from_camera(serial: str, selection: SelectedDownloadModel):
     """Download selected files from a camera. COHN-first, WiFi-direct fallback."""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"SELECTIVE DOWNLOAD REQUEST for camera {serial}: {len(selection.files)} files")
 
         camera = camera_manager.get_camera(serial)
         if not camera:
             raise HTTPException(status_code=404, detail="Camera not found")
 
-        file_list = [{"directory": f.directory, "filename": f.filename} for f in selection.files]
+        file_list = [(f.directory, f.filename) for f in selection.files]
 
         # --- COHN path ---
         cohn = _get_cohn_params(serial)
@@ -1871,12 +1999,7 @@ async def download_selected_from_camera(serial: str, selection: SelectedDownload
                 "message": f"Downloading {len(file_list)} selected file(s) via COHN..."
             })
 
-            async def cohn_progress(filename, current, total, percent):
-                await broadcast_message({
-                    "type": "download_progress", "serial": serial,
-                    "filename": filename, "current_file": current,
-                    "total_files": total, "percent": percent
-                })
+            cohn_progress = _cohn_progress_callback(serial)
 
             downloaded_files = await download_manager.async_download_selected_from_camera(
                 serial=serial, base_url=cohn["base_url"], auth_header=cohn["auth_header"],
@@ -1888,67 +2011,25 @@ async def download_selected_from_camera(serial: str, selection: SelectedDownload
                 "files_count": len(downloaded_files), "transport": "cohn"
             })
             return {"success": True, "files_count": len(downloaded_files),
-                    "files": [str(f) for f in downloaded_files], "transport": "cohn"}
+                    "files": downloaded_files, "transport": "cohn"}
 
         # --- WiFi direct fallback ---
         logger.info("No COHN credentials, falling back to WiFi direct")
-        loop = asyncio.get_event_loop()
-        on_gopro_already = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-
-        # Enable WiFi AP on camera via BLE
-        if camera.connected and camera.gopro and camera.gopro.is_ble_connected:
-            await camera.enable_wifi()
-
-        # Connect to camera WiFi
-        await broadcast_message({
-            "type": "download_status", "serial": serial,
-            "status": "connecting_wifi", "transport": "wifi_direct",
-            "message": f"Connecting to {camera.wifi_ssid}..."
-        })
-
-        wifi_success = await loop.run_in_executor(
-            None, wifi_manager.connect_wifi, camera.wifi_ssid, camera.wifi_password
-        )
-
-        if not wifi_success:
-            error_msg = f"Failed to connect to camera WiFi: {camera.wifi_ssid}"
-            await broadcast_message({"type": "download_error", "serial": serial, "error": error_msg})
-            raise HTTPException(status_code=500, detail=error_msg)
-
-        await broadcast_message({
-            "type": "download_status", "serial": serial,
-            "status": "wifi_connected", "transport": "wifi_direct",
-            "message": f"Connected. Downloading {len(selection.files)} selected file(s)..."
-        })
-
-        def progress_callback(filename: str, current: int, total: int, percent: int):
-            try:
-                asyncio.run_coroutine_threadsafe(
-                    broadcast_message({
-                        "type": "download_progress", "serial": serial,
-                        "filename": filename, "current_file": current,
-                        "total_files": total, "percent": percent
-                    }),
-                    loop
-                )
-            except Exception as e:
-                logger.warning(f"Could not broadcast progress: {e}")
+        loop = asyncio.get_running_loop()
+        async with _camera_wifi_session(camera, "download_status", _download_error_event(serial)):
+            await broadcast_message({
+                "type": "download_status", "serial": serial,
+                "status": "wifi_connected", "transport": "wifi_direct",
+                "message": f"Connected. Downloading {len(selection.files)} selected file(s)..."
+            })
 
-        downloaded_files = await loop.run_in_executor(
-            None,
-            download_manager.download_selected_from_camera,
-            serial, file_list, progress_callback
-        )
+            progress_callback = _download_progress_callback(serial, loop)
 
-        # Reconnect to home WiFi
-        if not on_gopro_already:
-            await loop.run_in_executor(None, wifi_manager.disconnect)
-            for attempt in range(10):
-                await asyncio.sleep(2)
-                current_ip = await loop.run_in_executor(None, wifi_manager.get_current_ip)
-                still_on_gopro = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-                if current_ip and not still_on_gopro:
-                    break
+            downloaded_files = await loop.run_in_executor(
+                None,
+                download_manager.download_selected_from_camera,
+                serial, file_list, progress_callback
+            )
 
         await broadcast_message({
             "type": "download_complete", "serial": serial,
@@ -1956,7 +2037,7 @@ async def download_selected_from_camera(serial: str, selection: SelectedDownload
         })
 
         return {"success": True, "files_count": len(downloaded_files),
-                "files": [str(f) for f in downloaded_files], "transport": "wifi_direct"}
+                "files": downloaded_files, "transport": "wifi_direct"}
 
     except HTTPException:
         raise
@@ -1971,7 +2052,7 @@ async def download_selected_from_camera(serial: str, selection: SelectedDownload
 async def browse_camera(serial: str):
     """Browse media files on a camera SD card. COHN-first, WiFi-direct fallback."""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"BROWSE REQUEST for camera {serial}")
 
         camera = camera_manager.get_camera(serial)
@@ -2002,52 +2083,16 @@ async def browse_camera(serial: str):
 
         # --- WiFi direct fallback ---
         logger.info("No COHN credentials, falling back to WiFi direct")
-        loop = asyncio.get_event_loop()
-        on_gopro_already = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-
-        # Enable WiFi AP on camera via BLE
-        if camera.connected and camera.gopro and camera.gopro.is_ble_connected:
-            await camera.enable_wifi()
-
-        await broadcast_message({
-            "type": "browse_status", "serial": serial,
-            "status": "connecting_wifi", "transport": "wifi_direct",
-            "message": f"Connecting to {camera.wifi_ssid}..."
-        })
-
-        wifi_success = await loop.run_in_executor(
-            None, wifi_manager.connect_wifi, camera.wifi_ssid, camera.wifi_password
-        )
-
-        if not wifi_success:
-            error_msg = f"Failed to connect to camera WiFi: {camera.wifi_ssid}"
-            await broadcast_message({"type": "browse_status", "serial": serial, "status": "error", "message": error_msg})
-            raise HTTPException(status_code=500, detail=error_msg)
-
-        await broadcast_message({
-            "type": "browse_status", "serial": serial,
-            "status": "scanning", "transport": "wifi_direct",
-            "message": "Scanning camera media..."
-        })
-
-        summary = await loop.run_in_executor(None, download_manager.get_media_summary)
-
-        logger.info(f"Found {summary['total_files']} files ({summary['total_size_human']})")
-
-        # Reconnect to home WiFi
-        if not on_gopro_already:
+        async with _camera_wifi_session(camera, "browse_status", _browse_error_event(serial)):
             await broadcast_message({
                 "type": "browse_status", "serial": serial,
-                "status": "reconnecting_wifi", "transport": "wifi_direct",
-                "message": "Reconnecting to home WiFi..."
+                "status": "scanning", "transport": "wifi_direct",
+                "message": "Scanning camera media..."
             })
-            await loop.run_in_executor(None, wifi_manager.disconnect)
-            for attempt in range(10):
-                await asyncio.sleep(2)
-                current_ip = await loop.run_in_executor(None, wifi_manager.get_current_ip)
-                still_on_gopro = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-                if current_ip and not still_on_gopro:
-                    break
+
+            summary = await _sd_call(download_manager.get_media_summary)
+
+            logger.info(f"Found {summary['total_files']} files ({summary['total_size_human']})")
 
         await broadcast_message({
             "type": "browse_complete", "serial": serial,
@@ -2099,9 +2144,7 @@ async def get_media_summary(serial: str):
             await camera.enable_wifi()
 
         # Connect to camera WiFi
-        loop = asyncio.get_event_loop()
-        wifi_success = await loop.run_in_executor(
-            None,
+        wifi_success = await _wifi_call(
             wifi_manager.connect_wifi,
             camera.wifi_ssid,
             camera.wifi_password
@@ -2111,7 +2154,7 @@ async def get_media_summary(serial: str):
             raise HTTPException(status_code=500, detail=f"Failed to connect to camera WiFi: {camera.wifi_ssid}")
 
         # Get media summary
-        summary = await loop.run_in_executor(None, download_manager.get_media_summary)
+        summary = await _sd_call(download_manager.get_media_summary)
 
         logger.info(f"Media summary for {serial}: {summary['total_files']} files, {summary['total_size_human']}")
 
@@ -2135,18 +2178,15 @@ async def erase_sd_card(serial: str):
         if camera.recording:
             raise HTTPException(status_code=400, detail=f"Camera {serial} is currently recording. Stop recording before erasing.")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"🗑️  ERASE SD CARD REQUEST for camera {serial}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         # Try COHN first (no WiFi switching needed)
         creds = cohn_manager.get_credentials(serial)
         if creds and creds.get("ip_address"):
             ip = creds["ip_address"]
-            username = creds.get("username", "")
-            password = creds.get("password", "")
-            auth_token = base64.b64encode(f"{username}:{password}".encode()).decode()
-            auth_header = f"Basic {auth_token}"
+            auth_header = cohn_manager.get_auth_header(serial)
 
             logger.info(f"Erasing via COHN: https://{ip}/gp/gpControl/command/storage/delete/all")
             try:
@@ -2166,19 +2206,20 @@ async def erase_sd_card(serial: str):
             if not camera.connected:
                 raise HTTPException(status_code=400, detail=f"Camera {serial} is not connected and has no COHN credentials.")
 
-            loop = asyncio.get_event_loop()
-            on_gopro_already = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-
-            if camera.connected and camera.gopro and camera.gopro.is_ble_connected:
-                await camera.enable_wifi()
+            # One IP probe tells us where we started; run it alongside the BLE AP enable
+            probe = wifi_manager.async_is_on_gopro_network()
+            if camera.gopro and camera.gopro.is_ble_connected:
+                on_gopro_already, _ = await asyncio.gather(probe, camera.enable_wifi())
+            else:
+                on_gopro_already = await probe
 
-            wifi_success = await loop.run_in_executor(
-                None, wifi_manager.connect_wifi, camera.wifi_ssid, camera.wifi_password
+            wifi_success = await _wifi_call(
+                wifi_manager.connect_wifi, camera.wifi_ssid, camera.wifi_password
             )
             if not wifi_success:
                 raise HTTPException(status_code=500, detail=f"Failed to connect to camera WiFi: {camera.wifi_ssid}")
 
-            success = await loop.run_in_executor(None, download_manager.erase_all_media)
+            success = await _sd_call(download_manager.erase_all_media)
 
             if success:
                 logger.info(f"✅ Successfully erased all media from camera {serial} via WiFi direct")
@@ -2187,14 +2228,10 @@ async def erase_sd_card(serial: str):
 
             if not on_gopro_already:
                 logger.info("Reconnecting to home WiFi...")
-                await loop.run_in_executor(None, wifi_manager.disconnect)
-                for attempt in range(10):
-                    await asyncio.sleep(2)
-                    current_ip = await loop.run_in_executor(None, wifi_manager.get_current_ip)
-                    still_on_gopro = await loop.run_in_executor(None, wifi_manager.is_on_gopro_network)
-                    if current_ip and not still_on_gopro:
-                        logger.info(f"✅ Reconnected to home WiFi (IP: {current_ip})")
-                        break
+                await _wifi_call(wifi_manager.disconnect)
+                current_ip = await _wait_for_home_wifi()
+                if current_ip:
+                    logger.info(f"✅ Reconnected to home WiFi (IP: {current_ip})")
 
         # Broadcast WebSocket message
         await broadcast_message({
@@ -2218,8 +2255,10 @@ async def erase_sd_card(serial: str):
 @app.get("/api/downloads/list")
 async def list_downloaded_files(serial: Optional[str] = None):
     """Get list of downloaded files"""
-    files = download_manager.get_downloaded_files(serial)
-    return {"files": files}
+    # The directory walk stats every file; keep it off the event loop
+    files = await asyncio.to_thread(download_manager.get_downloaded_files, serial)
+    # Rows are plain str/int dicts, so render directly and skip jsonable_encoder's full walk
+    return _DefaultResponse({"files": files})
 
 
 @app.post("/api/upload")
@@ -2227,14 +2266,14 @@ async def upload_file(upload: UploadModel):
     """Upload a file to S3"""
     try:
         # Check if we're on GoPro WiFi (no internet) — use IP-based detection for macOS 26+
-        if wifi_manager.is_on_gopro_network():
-            current_wifi = wifi_manager.get_current_wifi() or "GoPro WiFi"
-            logger.warning("=" * 60)
+        if await wifi_manager.async_is_on_gopro_network():
+            current_wifi = await wifi_manager.async_get_current_wifi() or "GoPro WiFi"
+            logger.warning(_BAR)
             logger.warning(f"⚠️  WARNING: Still connected to GoPro WiFi: {current_wifi}")
             logger.warning(f"⚠️  GoPro WiFi has no internet connectivity!")
             logger.warning(f"⚠️  You need to disconnect and connect to your home/office WiFi")
             logger.warning(f"⚠️  Upload will fail without internet connectivity")
-            logger.warning("=" * 60)
+            logger.warning(_BAR)
             raise HTTPException(
                 status_code=400,
                 detail=f"Cannot upload while connected to GoPro WiFi ({current_wifi}). Please disconnect and connect to a WiFi network with internet access."
@@ -2266,12 +2305,10 @@ async def upload_file(upload: UploadModel):
 async def create_and_upload_zip(zip_request: CreateZipModel):
     """Create ZIP of files and upload to S3"""
     try:
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info("📦 CREATE ZIP REQUEST")
         logger.info(f"Files to zip: {len(zip_request.file_paths)}")
 
-        import zipfile
-        import tempfile
         from datetime import datetime
 
         # Verify all files exist
@@ -2310,64 +2347,49 @@ async def create_and_upload_zip(zip_request: CreateZipModel):
             else:
                 zip_filename = f"gopro_downloads_{timestamp}.zip"
 
-        # Create temporary ZIP file
-        with tempfile.NamedTemporaryFile(mode='w+b', suffix='.zip', delete=False) as temp_zip:
-            temp_zip_path = Path(temp_zip.name)
-
-            logger.info(f"Creating ZIP: {zip_filename}")
-            logger.info(f"Temp path: {temp_zip_path}")
-
-            # Create ZIP
-            with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in file_paths:
-                    # Use relative path in ZIP (camera_serial/filename.mp4)
-                    arcname = f"{file_path.parent.name}/{file_path.name}"
-                    logger.info(f"  Adding: {arcname}")
-                    zipf.write(file_path, arcname=arcname)
-
-            zip_size_mb = temp_zip_path.stat().st_size / (1024 * 1024)
-            logger.info(f"✓ ZIP created: {zip_size_mb:.1f} MB")
-
-            # Upload ZIP to S3 via shared helper
-            s3_key = f"zips/{zip_filename}"
-            logger.info(f"Uploading ZIP to S3 (key: {s3_key})...")
-
-            s3_url = await download_manager.upload_file_to_backend(
-                temp_zip_path, s3_key,
-                zip_request.backend_url, zip_request.api_key,
-                content_type="application/zip"
-            )
-            if not s3_url:
-                s3_url = f"https://your-bucket.s3.amazonaws.com/{s3_key}"
-                logger.warning(f"Backend didn't return URL, using fallback: {s3_url}")
-
-            # Clean up temp file
-            temp_zip_path.unlink()
-
-            logger.info("")
-            logger.info("=" * 80)
-            logger.info("=" * 80)
-            logger.info(f"✅ ZIP UPLOAD COMPLETE!")
-            logger.info("=" * 80)
-            logger.info(f"📦 Filename: {zip_filename}")
-            logger.info(f"📊 Size: {zip_size_mb:.1f} MB")
-            logger.info(f"📁 Files: {len(file_paths)}")
-            logger.info("=" * 80)
-            logger.info("")
-            logger.info("🔗 DOWNLOAD ZIP URL:")
-            logger.info("")
-            logger.info(f"   {s3_url}")
-            logger.info("")
-            logger.info("=" * 80)
-            logger.info("=" * 80)
+        # Stream a STORED ZIP straight into the upload (no temp file; media
+        # is already compressed so DEFLATE would only burn CPU)
+        s3_key = f"zips/{zip_filename}"
+        logger.info(f"Streaming {zip_filename} to S3 (key: {s3_key})...")
+        zip_entries = []
+        for file_path in file_paths:
+            # Use relative path in ZIP (camera_serial/filename.mp4)
+            arcname = f"{file_path.parent.name}/{file_path.name}"
+            logger.info(f"  Adding: {arcname}")
+            zip_entries.append((file_path, arcname))
+
+        s3_url, zip_size = await download_manager.upload_zip_to_backend(
+            zip_entries, s3_key, zip_request.backend_url, zip_request.api_key
+        )
+        if not s3_url:
+            s3_url = f"https://your-bucket.s3.amazonaws.com/{s3_key}"
+            logger.warning(f"Backend didn't return URL, using fallback: {s3_url}")
+
+        zip_size_mb = zip_size / (1024 * 1024)
+        logger.info("")
+        logger.info("=" * 80)
+        logger.info("=" * 80)
+        logger.info(f"✅ ZIP UPLOAD COMPLETE!")
+        logger.info("=" * 80)
+        logger.info(f"📦 Filename: {zip_filename}")
+        logger.info(f"📊 Size: {zip_size_mb:.1f} MB")
+        logger.info(f"📁 Files: {len(file_paths)}")
+        logger.info("=" * 80)
+        logger.info("")
+        logger.info("🔗 DOWNLOAD ZIP URL:")
+        logger.info("")
+        logger.info(f"   {s3_url}")
+        logger.info("")
+        logger.info("=" * 80)
+        logger.info("=" * 80)
 
-            return {
-                "success": True,
-                "zip_url": s3_url,
-                "zip_filename": zip_filename,
-                "zip_size_mb": round(zip_size_mb, 2),
-                "files_count": len(file_paths)
-            }
+        return {
+            "success": True,
+            "zip_url": s3_url,
+            "zip_filename": zip_filename,
+            "zip_size_mb": round(zip_size_mb, 2),
+            "files_count": len(file_paths)
+        }
 
     except HTTPException:
         raise
@@ -2564,31 +2586,19 @@ async def capture_preset(serial: str, body: dict):
 async def apply_preset(name: str, body: PresetApplyModel):
     """Apply a preset to one or more cameras"""
     try:
-        preset = preset_manager.get_preset(name)
-        if not preset:
+        # Only the setting keys (metadata like created_at excluded); memoized per preset
+        settings = preset_manager.get_settings(name)
+        if settings is None:
             raise HTTPException(status_code=404, detail=f"Preset '{name}' not found")
 
-        # Extract only the setting keys (exclude metadata like created_at)
-        setting_keys = {"resolution", "fps", "video_fov", "hypersmooth", "anti_flicker", "shutter"}
-        settings = {k: v for k, v in preset.items() if k in setting_keys}
-
-        # Determine target cameras
-        if body.serials:
-            targets = [(s, camera_manager.get_camera(s)) for s in body.serials]
-            targets = [(s, c) for s, c in targets if c and c.connected]
-        else:
-            targets = [(s, c) for s, c in camera_manager.cameras.items() if c.connected]
+        targets = camera_manager.get_connected_cameras(body.serials or None)
 
         if not targets:
             raise HTTPException(status_code=400, detail="No connected cameras to apply preset to")
 
-        results = {}
-        for serial, camera in targets:
-            try:
-                result = await camera.apply_settings(settings)
-                results[serial] = result
-            except Exception as e:
-                results[serial] = {"error": str(e)}
+        # Cameras are independent: fan out so total time is the slowest camera, not the sum
+        settled = await _gather_by_serial({s: c.apply_settings(settings) for s, c in targets})
+        results = {s: {"error": str(r)} if isinstance(r, Exception) else r for s, r in settled.items()}
 
         return {"success": True, "results": results}
     except HTTPException:
@@ -2673,6 +2683,13 @@ GOPRO_SETTING_VALUES = {
     },
 }
 
+# Case-insensitive view of GOPRO_SETTING_VALUES for the apply path: one lookup per
+# setting, and "on"/"Linear"/"auto" resolve without needing every spelling listed
+_SETTING_OPTIONS = {
+    setting: {alias.casefold(): option for alias, option in values.items()}
+    for setting, values in GOPRO_SETTING_VALUES.items()
+}
+
 
 def _get_cohn_params(serial: str) -> Optional[dict]:
     """Return COHN base_url + auth_header if camera is COHN-provisioned, else None."""
@@ -2688,8 +2705,7 @@ def _get_cohn_params(serial: str) -> Optional[dict]:
 async def _cohn_http_get(ip: str, auth_header: str, path: str, timeout: float = 10.0) -> httpx.Response:
     """Make an authenticated HTTPS GET to a COHN camera"""
     headers = {"Authorization": auth_header} if auth_header else {}
-    async with httpx.AsyncClient(verify=False, timeout=timeout) as client:
-        return await client.get(f"https://{ip}{path}", headers=headers)
+    return await _COHN_HTTP.get(f"https://{ip}{path}", headers=headers, timeout=timeout)
 
 
 async def _cohn_set_setting(ip: str, auth_header: str, setting_name: str, value_str: str) -> dict:
@@ -2698,8 +2714,7 @@ async def _cohn_set_setting(ip: str, auth_header: str, setting_name: str, value_
     if setting_id is None:
         return {"error": f"Unknown setting: {setting_name}"}
 
-    values_map = GOPRO_SETTING_VALUES.get(setting_name, {})
-    option = values_map.get(value_str)
+    option = _SETTING_OPTIONS.get(setting_name, {}).get(value_str.casefold())
     if option is None:
         try:
             option = int(value_str)
@@ -2728,6 +2743,25 @@ async def _cohn_get_state(ip: str, auth_header: str) -> dict:
         return {"error": f"{type(e).__name__}: {e}"}
 
 
+async def _cohn_apply_settings_to(serial: str, ip: str, settings: dict) -> dict:
+    """Apply settings to one COHN camera. Kept in order per camera (resolution/fps/FOV
+    constrain each other); callers fan out across cameras."""
+    auth = cohn_manager.get_auth_header(serial)
+    return {name: await _cohn_set_setting(ip, auth, name, str(value)) for name, value in settings.items()}
+
+
+async def _cohn_apply_settings_all(targets: Dict[str, dict], settings: dict) -> Dict[str, dict]:
+    """Apply settings to every target camera concurrently -> {serial: {setting: result}}"""
+    results = {serial: {"error": "No IP"} for serial, creds in targets.items() if not creds.get("ip_address")}
+    settled = await _gather_by_serial({
+        serial: _cohn_apply_settings_to(serial, creds["ip_address"], settings)
+        for serial, creds in targets.items() if creds.get("ip_address")
+    })
+    for serial, result in settled.items():
+        results[serial] = {"error": f"{type(result).__name__}: {result}"} if isinstance(result, Exception) else result
+    return results
+
+
 @app.post("/api/cohn/settings/apply")
 async def cohn_apply_settings(body: dict):
     """Apply settings to all COHN cameras via HTTPS (no BLE needed)"""
@@ -2743,19 +2777,7 @@ async def cohn_apply_settings(body: dict):
     if not targets:
         raise HTTPException(status_code=400, detail="No provisioned cameras")
 
-    results = {}
-    for serial, creds in targets.items():
-        ip = creds.get("ip_address")
-        auth = cohn_manager.get_auth_header(serial)
-        if not ip:
-            results[serial] = {"error": "No IP"}
-            continue
-
-        cam_results = {}
-        for setting_name, value_str in settings.items():
-            cam_results[setting_name] = await _cohn_set_setting(ip, auth, setting_name, str(value_str))
-        results[serial] = cam_results
-
+    results = await _cohn_apply_settings_all(targets, settings)
     return {"results": results}
 
 
@@ -2763,15 +2785,9 @@ async def cohn_apply_settings(body: dict):
 async def cohn_enable_gps():
     """Enable GPS on all COHN cameras"""
     all_creds = cohn_manager.get_all_credentials()
-    results = {}
-    for serial, creds in all_creds.items():
-        ip = creds.get("ip_address")
-        auth = cohn_manager.get_auth_header(serial)
-        if ip:
-            results[serial] = await _cohn_set_setting(ip, auth, "gps", "ON")
-        else:
-            results[serial] = {"error": "No IP"}
-    return {"results": results}
+    results = await _cohn_apply_settings_all(all_creds, {"gps": "ON"})
+    # Flatten to one result per camera
+    return {"results": {serial: r.get("gps", r) for serial, r in results.items()}}
 
 
 @app.get("/api/cohn/camera/state/{serial}")
@@ -2782,19 +2798,23 @@ async def cohn_get_camera_state(serial: str):
         raise HTTPException(status_code=404, detail="Camera not provisioned")
     ip = creds.get("ip_address")
     auth = cohn_manager.get_auth_header(serial)
-    return await _cohn_get_state(ip, auth)
+    # Pure proxy: forward the camera's JSON bytes as-is instead of parsing and re-encoding
+    try:
+        resp = await _cohn_http_get(ip, auth, "/gopro/camera/state")
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    if resp.status_code != 200:
+        return {"error": f"HTTP {resp.status_code}"}
+    return Response(content=resp.content, media_type="application/json")
 
 
 @app.post("/api/presets/{name}/apply-cohn")
 async def apply_preset_cohn(name: str, body: dict = {}):
     """Apply a preset to COHN cameras via HTTPS (no BLE needed)"""
-    preset = preset_manager.get_preset(name)
-    if not preset:
+    settings = preset_manager.get_settings(name)
+    if settings is None:
         raise HTTPException(status_code=404, detail=f"Preset '{name}' not found")
 
-    setting_keys = {"resolution", "fps", "video_fov", "hypersmooth", "anti_flicker", "shutter"}
-    settings = {k: v for k, v in preset.items() if k in setting_keys and v is not None}
-
     serials = body.get("serials")
     all_creds = cohn_manager.get_all_credentials()
     targets = {s: all_creds[s] for s in serials if s in all_creds} if serials else all_creds
@@ -2802,29 +2822,62 @@ async def apply_preset_cohn(name: str, body: dict = {}):
     if not targets:
         raise HTTPException(status_code=400, detail="No provisioned cameras")
 
-    results = {}
-    for serial, creds in targets.items():
-        ip = creds.get("ip_address")
-        auth = cohn_manager.get_auth_header(serial)
-        if not ip:
-            results[serial] = {"error": "No IP"}
-            continue
-        cam_results = {}
-        for setting_name, value_str in settings.items():
-            cam_results[setting_name] = await _cohn_set_setting(ip, auth, setting_name, str(value_str))
-        results[serial] = cam_results
-
+    results = await _cohn_apply_settings_all(targets, settings)
     return {"success": True, "results": results}
 
 
 # ============== COHN (Camera on Home Network) ==============
 
-def _get_cohn_ssl_context(creds: dict, serial: str):
-    """Build SSL context for GoPro COHN cameras (self-signed certs, skip verification)"""
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-    return ctx
+async def _settle(coro: Awaitable) -> Any:
+    """Await coro, returning its exception instead of raising (per-camera isolation)."""
+    try:
+        return await coro
+    except Exception as e:
+        return e
+
+
+async def _gather_by_serial(coros: Dict[str, Awaitable]) -> Dict[str, Any]:
+    """Run one coroutine per camera concurrently -> {serial: result or exception}.
+    On 3.11+ a TaskGroup scopes the tasks, so a cancelled request cancels the whole
+    fan-out at once; a failing camera never cancels its siblings."""
+    if sys.version_info >= (3, 11):
+        async with asyncio.TaskGroup() as tg:
+            tasks = {serial: tg.create_task(_settle(coro)) for serial, coro in coros.items()}
+        return {serial: task.result() for serial, task in tasks.items()}
+    results = await asyncio.gather(*coros.values(), return_exceptions=True)
+    return dict(zip(coros, results))
+
+
+def _rebuild_fast_ip_table():
+    """Rebuild the last-octet lookup table from _cohn_ip_to_serial.
+    Octets shared by more than one camera are left empty so the demuxer falls back to the dict."""
+    table: List[Optional[tuple]] = [None] * 256
+    collisions = set()
+    for ip, serial in _cohn_ip_to_serial.items():
+        try:
+            octet = int(ip.rpartition('.')[2])
+        except ValueError:
+            continue
+        if not 0 <= octet < 256:
+            continue
+        if table[octet] is not None:
+            collisions.add(octet)
+        table[octet] = (ip, serial)
+    for octet in collisions:
+        table[octet] = None
+    _fast_ip_table[:] = table
+
+
+def _register_cohn_ip(ip: str, serial: str):
+    """Map a camera IP to its serial for the UDP demuxer."""
+    _cohn_ip_to_serial[ip] = serial
+    _rebuild_fast_ip_table()
+
+
+def _unregister_cohn_ip(ip: str):
+    """Remove a camera IP from the UDP demuxer mappings."""
+    _cohn_ip_to_serial.pop(ip, None)
+    _rebuild_fast_ip_table()
 
 
 def _udp_listener_thread():
@@ -2849,21 +2902,65 @@ def _udp_listener_thread():
         pkt_count += 1
         if pkt_count <= 6:
             logger.info(f"[COHN UDP] Packet #{pkt_count} from {addr}, size={len(data)}, mapped={_cohn_ip_to_serial.get(src_ip, 'UNKNOWN')}")
-        serial = _cohn_ip_to_serial.get(src_ip)
+        # Fast path: index by last octet (cameras normally share a /24), dict fallback
+        entry = _fast_ip_table[int(src_ip[src_ip.rfind('.') + 1:])]
+        if entry is not None and entry[0] == src_ip:
+            serial = entry[1]
+        else:
+            serial = _cohn_ip_to_serial.get(src_ip)
         if not serial:
             continue
-        # Write to ffmpeg transcoder stdin (H.265 → H.264)
-        proc = _cohn_ffmpeg_procs.get(serial)
-        if proc and proc.poll() is None:
-            try:
-                proc.stdin.write(data)
-                proc.stdin.flush()
-            except (BrokenPipeError, OSError):
-                pass
+        # Hand off to the camera's stdin writer; a stalled ffmpeg must not block other cameras
+        feed = _cohn_ffmpeg_feeds.get(serial)
+        if feed is not None:
+            _feed_put(feed, data)
     sock.close()
     logger.info("[COHN UDP] Listener thread stopped")
 
 
+def _feed_put(feed: queue.Queue, item):
+    """Non-blocking put; drops the oldest packet when full (live preview prefers fresh data)."""
+    try:
+        feed.put_nowait(item)
+    except queue.Full:
+        try:
+            feed.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            feed.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def _ffmpeg_writer_thread(serial: str, proc: subprocess.Popen, feed: queue.Queue):
+    """Per-camera thread: drains the feed into ffmpeg's stdin until stopped (None) or the pipe breaks.
+    Packets that queued up during the previous write go out together (one syscall per batch,
+    not per 1316-byte datagram); a lone packet is still written immediately."""
+    stopping = False
+    while not stopping:
+        data = feed.get()
+        if data is None:
+            break
+        batch = [data]
+        size = len(data)
+        while size < _FFMPEG_WRITE_MAX:
+            try:
+                data = feed.get_nowait()
+            except queue.Empty:
+                break
+            if data is None:
+                stopping = True
+                break
+            batch.append(data)
+            size += len(data)
+        try:
+            proc.stdin.write(b"".join(batch) if len(batch) > 1 else batch[0])
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            break
+
+
 def _ensure_udp_thread():
     """Start the UDP listener thread if not already running."""
     global _udp_thread, _udp_running
@@ -2884,7 +2981,27 @@ def _stop_udp_thread():
         _udp_thread = None
 
 
-def _ffmpeg_reader_thread(serial: str, proc: subprocess.Popen):
+def _fan_out_stream_chunk(serial: str, data: bytes):
+    """Push a transcoded chunk to every browser client queue (runs on the event loop)."""
+    for q in list(_cohn_stream_clients.get(serial, [])):
+        try:
+            q.put_nowait(data)
+        except asyncio.QueueFull:
+            # Drain stale data to make room (drop oldest to keep stream fresh)
+            dropped = 0
+            while dropped < 50:
+                try:
+                    q.get_nowait()
+                    dropped += 1
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                q.put_nowait(data)
+            except asyncio.QueueFull:
+                pass
+
+
+def _ffmpeg_reader_thread(serial: str, proc: subprocess.Popen, loop: asyncio.AbstractEventLoop):
     """Read transcoded H.264 MPEG-TS from ffmpeg stdout and fan out to browser clients."""
     logger.info(f"[COHN {serial}] Reader thread started")
     while True:
@@ -2894,22 +3011,10 @@ def _ffmpeg_reader_thread(serial: str, proc: subprocess.Popen):
             break
         if not data:
             break
-        for q in list(_cohn_stream_clients.get(serial, [])):
-            try:
-                q.put_nowait(data)
-            except queue.Full:
-                # Drain stale data to make room (drop oldest to keep stream fresh)
-                dropped = 0
-                while dropped < 50:
-                    try:
-                        q.get_nowait()
-                        dropped += 1
-                    except queue.Empty:
-                        break
-                try:
-                    q.put_nowait(data)
-                except queue.Full:
-                    pass
+        try:
+            loop.call_soon_threadsafe(_fan_out_stream_chunk, serial, data)
+        except RuntimeError:
+            break  # event loop closed
     logger.info(f"[COHN {serial}] Reader thread stopped")
 
 
@@ -2945,7 +3050,9 @@ def _start_transcoder(serial: str) -> bool:
         if sys.platform == "win32":
             popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
         else:
-            popen_kwargs["preexec_fn"] = lambda: signal.signal(signal.SIGINT, signal.SIG_IGN)
+            # Own session: terminal Ctrl-C doesn't reach ffmpeg, and unlike preexec_fn
+            # this keeps the fast vfork/posix_spawn path and is thread-safe
+            popen_kwargs["start_new_session"] = True
         proc = subprocess.Popen(
             cmd,
             stdin=subprocess.PIPE,
@@ -2955,8 +3062,13 @@ def _start_transcoder(serial: str) -> bool:
         )
         _cohn_ffmpeg_procs[serial] = proc
 
+        feed = _cohn_ffmpeg_feeds[serial] = queue.Queue(maxsize=_FFMPEG_FEED_SIZE)
+        threading.Thread(target=_ffmpeg_writer_thread, args=(serial, proc, feed), daemon=True).start()
+
         reader = threading.Thread(
-            target=_ffmpeg_reader_thread, args=(serial, proc), daemon=True
+            target=_ffmpeg_reader_thread,
+            args=(serial, proc, asyncio.get_running_loop()),
+            daemon=True
         )
         _cohn_reader_threads[serial] = reader
         reader.start()
@@ -2966,20 +3078,30 @@ def _start_transcoder(serial: str) -> bool:
         return False
 
 
+def _reap_transcoder(serial: str, proc: subprocess.Popen):
+    """Wait for a terminated ffmpeg to exit (runs off the event loop)."""
+    try:
+        proc.stdin.close()
+    except Exception:
+        pass
+    try:
+        proc.wait(timeout=3)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    logger.info(f"[COHN {serial}] Stopped transcoder")
+
+
 def _stop_transcoder(serial: str):
     """Stop ffmpeg transcoder and reader thread for a camera."""
     proc = _cohn_ffmpeg_procs.pop(serial, None)
+    feed = _cohn_ffmpeg_feeds.pop(serial, None)
+    if feed is not None:
+        _feed_put(feed, None)  # Stop the stdin writer
     if proc and proc.poll() is None:
-        try:
-            proc.stdin.close()
-        except Exception:
-            pass
         proc.terminate()
-        try:
-            proc.wait(timeout=3)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-        logger.info(f"[COHN {serial}] Stopped transcoder")
+        # Closing stdin / waiting can block for seconds; don't do it on the event loop
+        threading.Thread(target=_reap_transcoder, args=(serial, proc), daemon=True).start()
 
     # Reader thread will exit when proc.stdout closes
     _cohn_reader_threads.pop(serial, None)
@@ -2989,8 +3111,33 @@ def _stop_transcoder(serial: str):
     for q in clients:
         try:
             q.put_nowait(None)
-        except queue.Full:
+        except asyncio.QueueFull:
+            pass
+
+
+async def _cohn_webcam_cleanup(ip: str, headers: dict, **kwargs):
+    """Send webcam/stop and webcam/exit concurrently, ignoring failures."""
+    await asyncio.gather(
+        *(_COHN_HTTP.get(f"https://{ip}{path}", headers=headers, **kwargs)
+          for path in ("/gopro/webcam/stop", "/gopro/webcam/exit")),
+        return_exceptions=True
+    )
+
+
+async def _wait_webcam_idle(ip: str, headers: dict, timeout: float = 1.0):
+    """After cleanup, poll /gopro/webcam/status every 100ms until the camera reports
+    OFF (0) or IDLE (1), giving up after `timeout` (the old fixed settle time)."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        try:
+            resp = await _COHN_HTTP.get(f"https://{ip}/gopro/webcam/status", headers=headers,
+                                        timeout=max(deadline - loop.time(), 0.1))
+            if resp.status_code == 200 and resp.json().get("status") in (0, 1):
+                return
+        except Exception:
             pass
+        await asyncio.sleep(0.1)
 
 
 async def _start_single_cohn_preview(serial: str, creds: dict) -> dict:
@@ -2999,47 +3146,41 @@ async def _start_single_cohn_preview(serial: str, creds: dict) -> dict:
     if not ip:
         return {"success": False, "error": "No IP address"}
 
-    ssl_ctx = _get_cohn_ssl_context(creds, serial)
     auth_header = cohn_manager.get_auth_header(serial)
     headers = {"Authorization": auth_header} if auth_header else {}
 
     try:
         # Register IP→serial mapping for UDP demuxer thread
-        _cohn_ip_to_serial[ip] = serial
+        _register_cohn_ip(ip, serial)
         _start_transcoder(serial)
 
         # Ensure UDP listener thread is running
         _ensure_udp_thread()
 
         # Use webcam API to start streaming (sends TS over UDP to our IP:8554)
-        async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
-            # First ensure clean state
-            for cleanup_path in ["/gopro/webcam/stop", "/gopro/webcam/exit"]:
-                try:
-                    await client.get(f"https://{ip}{cleanup_path}", headers=headers)
-                except Exception:
-                    pass
-            await asyncio.sleep(1)
-
-            # Start webcam mode (sends to port 8554)
-            resp = await client.get(
-                f"https://{ip}/gopro/webcam/start?port={_COHN_UDP_PORT}",
-                headers=headers
-            )
-            logger.info(f"[COHN {serial}] webcam/start: {resp.status_code} {resp.text}")
-            if resp.status_code != 200:
-                _stop_transcoder(serial)
-                return {"success": False, "error": f"webcam/start HTTP {resp.status_code}"}
-
-            # Start preview (this triggers UDP streaming)
-            resp = await client.get(
-                f"https://{ip}/gopro/webcam/preview",
-                headers=headers
-            )
-            logger.info(f"[COHN {serial}] webcam/preview: {resp.status_code} {resp.text}")
-            if resp.status_code != 200:
-                _stop_transcoder(serial)
-                return {"success": False, "error": f"webcam/preview HTTP {resp.status_code}"}
+        # First ensure clean state
+        await _cohn_webcam_cleanup(ip, headers)
+        await _wait_webcam_idle(ip, headers)
+
+        # Start webcam mode (sends to port 8554)
+        resp = await _COHN_HTTP.get(
+            f"https://{ip}/gopro/webcam/start?port={_COHN_UDP_PORT}",
+            headers=headers
+        )
+        logger.info(f"[COHN {serial}] webcam/start: {resp.status_code} {resp.text}")
+        if resp.status_code != 200:
+            _stop_transcoder(serial)
+            return {"success": False, "error": f"webcam/start HTTP {resp.status_code}"}
+
+        # Start preview (this triggers UDP streaming)
+        resp = await _COHN_HTTP.get(
+            f"https://{ip}/gopro/webcam/preview",
+            headers=headers
+        )
+        logger.info(f"[COHN {serial}] webcam/preview: {resp.status_code} {resp.text}")
+        if resp.status_code != 200:
+            _stop_transcoder(serial)
+            return {"success": False, "error": f"webcam/preview HTTP {resp.status_code}"}
 
         # Direct MPEG-TS stream URL (no HLS, no ffmpeg — raw TS via chunked HTTP)
         stream_url = f"http://127.0.0.1:8000/api/cohn/stream/{serial}"
@@ -3055,23 +3196,17 @@ async def _stop_single_cohn_preview(serial: str, creds: dict) -> dict:
     if not ip:
         return {"success": False, "error": "No IP address"}
 
-    ssl_ctx = _get_cohn_ssl_context(creds, serial)
     auth_header = cohn_manager.get_auth_header(serial)
     headers = {"Authorization": auth_header} if auth_header else {}
 
     # Unregister stream and remove IP mapping
     _stop_transcoder(serial)
-    _cohn_ip_to_serial.pop(ip, None)
+    _unregister_cohn_ip(ip)
 
     try:
-        async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
-            # Stop webcam preview and exit webcam mode
-            for path in ["/gopro/webcam/stop", "/gopro/webcam/exit"]:
-                try:
-                    await client.get(f"https://{ip}{path}", headers=headers)
-                except Exception:
-                    pass
-            return {"success": True}
+        # Stop webcam preview and exit webcam mode
+        await _cohn_webcam_cleanup(ip, headers)
+        return {"success": True}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -3084,7 +3219,6 @@ async def _reenable_cohn_via_ble(serial: str) -> dict:
         return {"success": False, "error": "Camera not connected via BLE"}
 
     try:
-        gopro = cam.gopro
         # COHN enable command: Feature 0xF1, Action 0x65, Protobuf field 1 = True
         # Protobuf encoding: field_tag(1, varint) = 0x08, value = 0x01
         protobuf_data = bytes([0x08, 0x01])
@@ -3094,8 +3228,7 @@ async def _reenable_cohn_via_ble(serial: str) -> dict:
         from open_gopro.ble import BleUUID
         cq_command_uuid = BleUUID("CQ_COMMAND", hex="b5f90072-aa8d-11e3-9046-0002a5d5c51b")
 
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, gopro._ble.write, cq_command_uuid, payload)
+        await cam.ble_write(cq_command_uuid, payload)
         logger.info(f"[COHN {serial}] COHN enable command sent via BLE")
         return {"success": True}
     except Exception as e:
@@ -3103,14 +3236,32 @@ async def _reenable_cohn_via_ble(serial: str) -> dict:
         return {"success": False, "error": str(e)}
 
 
+# BLE adapters only sustain a few concurrent links; cap parallel re-enable writes
+_BLE_REENABLE_SEM: Optional[asyncio.Semaphore] = None
+
+
+def _ble_reenable_sem() -> asyncio.Semaphore:
+    """Created on first use so it binds to the serving loop (Python 3.9 binds at construction)"""
+    global _BLE_REENABLE_SEM
+    if _BLE_REENABLE_SEM is None:
+        _BLE_REENABLE_SEM = asyncio.Semaphore(int(os.environ.get("COHN_BLE_PARALLEL", "3")))
+    return _BLE_REENABLE_SEM
+
+
+async def _reenable_cohn_bounded(serial: str) -> dict:
+    async with _ble_reenable_sem():
+        return await _reenable_cohn_via_ble(serial)
+
+
 @app.post("/api/cohn/reenable")
 async def reenable_cohn_all():
     """Re-enable COHN on all provisioned cameras via BLE"""
     all_creds = cohn_manager.get_all_credentials()
-    results = {}
-    for serial in all_creds:
-        result = await _reenable_cohn_via_ble(serial)
-        results[serial] = result
+    settled = await _gather_by_serial({s: _reenable_cohn_bounded(s) for s in all_creds})
+    results = {
+        s: r if isinstance(r, dict) else {"success": False, "error": str(r)}
+        for s, r in settled.items()
+    }
     # Wait for cameras to connect to WiFi
     await asyncio.sleep(5)
     # Check which are now online
@@ -3156,20 +3307,14 @@ async def switch_cohn_network(body: dict):
         raise HTTPException(status_code=400, detail="wifi_password is required for new networks")
 
     cohn_manager.switch_network(wifi_ssid, wifi_password)
+    _cohn_online_cache.clear()  # Entries belong to the previous network
 
     # Return fresh status for the switched network
-    all_creds = cohn_manager.get_all_credentials()
-    online_status = await cohn_manager.check_all_cameras()
-    cameras = {}
-    for serial, creds in all_creds.items():
-        cameras[serial] = {
-            "provisioned": True,
-            "ip_address": creds.get("ip_address"),
-            "username": creds.get("username"),
-            "mac_address": creds.get("mac_address"),
-            "provisioned_at": creds.get("provisioned_at"),
-            "online": online_status.get(serial, False)
-        }
+    online_status = await _get_cohn_online()
+    cameras = {
+        serial: {**view, "online": online_status.get(serial, False)}
+        for serial, view in cohn_manager.get_status_views().items()
+    }
 
     return {
         "success": True,
@@ -3195,21 +3340,15 @@ async def update_camera_ip(serial: str, body: dict):
 
 
 @app.get("/api/cohn/status")
-async def get_cohn_status():
-    """Get COHN status for all cameras"""
-    all_creds = cohn_manager.get_all_credentials()
-    online_status = await cohn_manager.check_all_cameras()
-
-    result = {}
-    for serial, creds in all_creds.items():
-        result[serial] = {
-            "provisioned": True,
-            "ip_address": creds.get("ip_address"),
-            "username": creds.get("username"),
-            "mac_address": creds.get("mac_address"),
-            "provisioned_at": creds.get("provisioned_at"),
-            "online": online_status.get(serial, False)
-        }
+async def get_cohn_status(fresh: bool = False):
+    """Get COHN status for all cameras (online state from the background refresher;
+    pass ?fresh=true to probe now)"""
+    online_status = await _get_cohn_online(fresh)
+
+    result = {
+        serial: {**view, "online": online_status.get(serial, False)}
+        for serial, view in cohn_manager.get_status_views().items()
+    }
 
     # Include non-provisioned cameras
     for serial in camera_manager.cameras:
@@ -3264,7 +3403,7 @@ async def provision_cohn(serial: str, body: COHNProvisionModel):
             serial, body.wifi_ssid, body.wifi_password, progress_callback
         )
 
-        await broadcast_message({
+        _broadcast_nowait({
             "type": "cohn_provisioning_complete",
             "serial": serial,
             "ip_address": result.get("ip_address"),
@@ -3275,7 +3414,7 @@ async def provision_cohn(serial: str, body: COHNProvisionModel):
 
     except Exception as e:
         logger.error(f"COHN provisioning failed for {serial}: {e}", exc_info=True)
-        await broadcast_message({
+        _broadcast_nowait({
             "type": "cohn_provisioning_error",
             "serial": serial,
             "error": str(e)
@@ -3293,6 +3432,10 @@ async def remove_cohn_provision(serial: str):
         raise HTTPException(status_code=404, detail=f"No COHN credentials found for {serial}")
 
 
+_TS_BATCH_WINDOW_S = 0.02  # Max time a browser TS chunk waits for more data
+_TS_BATCH_MAX_BYTES = 64 * 1024
+
+
 @app.get("/api/cohn/stream/{serial}")
 async def stream_cohn_ts(serial: str):
     """Stream raw MPEG-TS directly to browser via chunked HTTP.
@@ -3300,34 +3443,43 @@ async def stream_cohn_ts(serial: str):
     if serial not in _cohn_stream_clients:
         raise HTTPException(status_code=404, detail="Camera not streaming")
 
-    client_queue: queue.Queue = queue.Queue(maxsize=10000)
+    client_queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
     _cohn_stream_clients[serial].append(client_queue)
     logger.info(f"[COHN {serial}] Browser client connected to stream")
 
-    def _blocking_get():
-        """Block in thread pool until data arrives (frees event loop)."""
-        return client_queue.get(timeout=2.0)
-
     async def generate():
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             while True:
-                # Wait for first chunk in a thread (doesn't block event loop)
-                try:
-                    first = await loop.run_in_executor(None, _blocking_get)
-                except queue.Empty:
-                    continue  # timeout, retry
+                # Reader thread hands chunks to the loop, so await directly (no executor hop)
+                first = await client_queue.get()
                 if first is None:
                     return  # stream stopped
 
-                # Batch any additional ready chunks
+                # Batch until 64 KB or 20 ms after the first chunk, whichever comes first
                 chunks = [first]
-                try:
-                    while len(chunks) < 100:
-                        chunks.append(client_queue.get_nowait())
-                except queue.Empty:
-                    pass
+                size = len(first)
+                deadline = loop.time() + _TS_BATCH_WINDOW_S
+                stopped = False
+                while size < _TS_BATCH_MAX_BYTES:
+                    try:
+                        chunk = client_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            chunk = await asyncio.wait_for(client_queue.get(), timeout=remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    if chunk is None:
+                        stopped = True
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
                 yield b"".join(chunks)
+                if stopped:
+                    return
         except asyncio.CancelledError:
             pass
         finally:
@@ -3350,28 +3502,147 @@ async def stream_cohn_ts(serial: str):
 
 
 _SNAPSHOT_BASE_PORT = 9100  # Snapshot captures use ports 9100+ (separate from stream port 8554)
+# Each capture holds an ffmpeg process + UDP socket; cap how many run at once (see _snapshot_sem)
+_SNAPSHOT_SEM: Optional[asyncio.Semaphore] = None
+# Latest JPEG per camera, served by /api/cohn/snapshot/blob/{serial} instead of inline base64
+_SNAPSHOT_CACHE: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()  # serial -> (jpeg, etag)
+_SNAPSHOT_CACHE_MAX = 32
+
+
+class _UdpToPipeProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol: forwards UDP packets into ffmpeg's asyncio stdin.
+    Packets arriving in the same loop iteration are coalesced into one writelines()."""
+
+    def __init__(self, proc_stdin: asyncio.StreamWriter):
+        self.stdin = proc_stdin
+        self._buf: List[bytes] = []
+
+    def datagram_received(self, data: bytes, addr):
+        if not data:
+            return
+        if not self._buf:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._buf.append(data)
+
+    def _flush(self):
+        buf, self._buf = self._buf, []
+        if self.stdin.is_closing():
+            return
+        try:
+            self.stdin.writelines(buf)
+        except (BrokenPipeError, ConnectionResetError, RuntimeError):
+            pass
+
+    def error_received(self, exc):
+        logger.debug(f"[COHN snapshot] UDP error: {exc}")
+
+
+async def _read_jpeg(stream: asyncio.StreamReader) -> bytes:
+    """Read one JPEG from ffmpeg's stdout, returning as soon as the EOI marker arrives."""
+    buf = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        buf += chunk
+        if buf.endswith(b"\xff\xd9"):
+            break
+    return bytes(buf)
+
+
+async def _read_tail(stream: asyncio.StreamReader, keep: int = 4096) -> bytes:
+    """Drain a pipe in large reads (so ffmpeg never blocks on it), keeping only the tail."""
+    tail = b""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return tail
+        tail = (tail + chunk)[-keep:]
+
+
+def _store_snapshot(serial: str, name: str, jpeg: bytes) -> dict:
+    """Put a captured JPEG in the snapshot LRU and build the API result for it."""
+    now = datetime.now()
+    stamp = int(now.timestamp() * 1000)
+    _SNAPSHOT_CACHE[serial] = (jpeg, f'"{serial}-{stamp}"')  # Capture stamp identifies the bytes
+    _SNAPSHOT_CACHE.move_to_end(serial)
+    while len(_SNAPSHOT_CACHE) > _SNAPSHOT_CACHE_MAX:
+        _SNAPSHOT_CACHE.popitem(last=False)
+    return {
+        "serial": serial,
+        "name": name,
+        "url": f"/api/cohn/snapshot/blob/{serial}?t={stamp}",
+        "timestamp": now.strftime("%H:%M:%S"),
+    }
 
 
-def _udp_to_pipe_thread(sock: socket.socket, proc_stdin, stop_event: threading.Event):
-    """Thread: read UDP packets from sock and write to ffmpeg stdin until stop or ffmpeg exits."""
+async def _grab_keyframe_from_live_stream(serial: str, name: str, timeout: float = 5.0) -> Optional[dict]:
+    """Decode one JPEG from a camera's running preview stream.
+    Taps the transcoder output like a browser client and lets ffmpeg decode from the
+    next keyframe (-g 15, so well under a second), instead of restarting the webcam.
+    Returns None if the camera isn't streaming or no frame arrives in time."""
+    clients = _cohn_stream_clients.get(serial)
+    if clients is None:
+        return None
+
+    ffmpeg_bin = shutil.which("ffmpeg") or ("ffmpeg.exe" if sys.platform == "win32" else "/opt/homebrew/bin/ffmpeg")
+    tap: asyncio.Queue = asyncio.Queue(maxsize=1000)
+    clients.append(tap)
+    proc = None
+    feeder = None
     try:
-        while not stop_event.is_set():
+        proc = await asyncio.create_subprocess_exec(
+            ffmpeg_bin,
+            "-y",
+            "-f", "mpegts",
+            "-i", "pipe:0",
+            "-frames:v", "1",
+            "-f", "image2",
+            "-vcodec", "mjpeg",
+            "-q:v", "2",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        async def feed():
             try:
-                data, _ = sock.recvfrom(65536)
-                if data:
-                    proc_stdin.write(data)
-                    proc_stdin.flush()
-            except socket.timeout:
-                continue
-            except (BrokenPipeError, OSError):
-                break
-    except Exception:
-        pass
+                while True:
+                    chunk = await tap.get()
+                    if chunk is None:
+                        break  # stream stopped
+                    proc.stdin.write(chunk)
+                    await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # ffmpeg exited after its frame
+            finally:
+                proc.stdin.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            jpeg = await asyncio.wait_for(_read_jpeg(proc.stdout), timeout=timeout)
+        except asyncio.TimeoutError:
+            jpeg = b""
+
+        if len(jpeg) > 500:
+            logger.info(f"[COHN {serial}] Snapshot taken from live stream: {len(jpeg)} bytes")
+            return _store_snapshot(serial, name, jpeg)
+        logger.warning(f"[COHN {serial}] No frame from live stream, falling back to webcam capture")
+        return None
+    except Exception as e:
+        logger.warning(f"[COHN {serial}] Live stream snapshot failed: {e}")
+        return None
     finally:
         try:
-            proc_stdin.close()
-        except Exception:
+            clients.remove(tap)
+        except ValueError:
             pass
+        if feeder:
+            feeder.cancel()
+        if proc and proc.returncode is None:
+            proc.kill()
+            await proc.wait()
 
 
 async def _capture_single_snapshot_inner(serial: str, ip: str, auth: str, port: int, name: str) -> dict:
@@ -3382,115 +3653,112 @@ async def _capture_single_snapshot_inner(serial: str, ip: str, auth: str, port:
     ffmpeg_bin = shutil.which("ffmpeg") or ("ffmpeg.exe" if sys.platform == "win32" else "/opt/homebrew/bin/ffmpeg")
     proc = None
     udp_sock = None
-    stop_event = threading.Event()
+    transport = None
     try:
-        async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
-            # Clean up any existing webcam state
-            for cleanup_path in ["/gopro/webcam/stop", "/gopro/webcam/exit"]:
-                try:
-                    await client.get(f"https://{ip}{cleanup_path}", headers=headers)
-                except Exception:
-                    pass
-            await asyncio.sleep(0.5)
+        # Clean up any existing webcam state
+        await _cohn_webcam_cleanup(ip, headers)
+        await _wait_webcam_idle(ip, headers, timeout=0.5)
+
+        # Bind our own UDP socket BEFORE telling the camera to stream
+        udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        # 4 MB lets the kernel absorb the 4K TS burst while ffmpeg warms up
+        # (macOS caps this at kern.ipc.maxsockbuf; keep the default if refused)
+        try:
+            udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        udp_sock.setblocking(False)
+        udp_sock.bind(("0.0.0.0", port))
 
-            # Bind our own UDP socket BEFORE telling the camera to stream
-            udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 512 * 1024)
-            udp_sock.settimeout(1.0)
-            udp_sock.bind(("0.0.0.0", port))
+        # Start webcam on dedicated snapshot port
+        resp = await _COHN_HTTP.get(
+            f"https://{ip}/gopro/webcam/start?port={port}", headers=headers
+        )
+        if resp.status_code != 200:
+            udp_sock.close()
+            return {"serial": serial, "name": name, "error": f"webcam/start HTTP {resp.status_code}"}
 
-            # Start webcam on dedicated snapshot port
-            resp = await client.get(
-                f"https://{ip}/gopro/webcam/start?port={port}", headers=headers
-            )
-            if resp.status_code != 200:
-                udp_sock.close()
-                return {"serial": serial, "name": name, "error": f"webcam/start HTTP {resp.status_code}"}
-
-            # Start ffmpeg reading from stdin pipe
-            popen_kwargs = {}
-            if sys.platform == "win32":
-                popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
-            proc = await asyncio.create_subprocess_exec(
-                ffmpeg_bin,
-                "-y",
-                "-fflags", "nobuffer+discardcorrupt+genpts",
-                "-analyzeduration", "10000000",
-                "-probesize", "5000000",
-                "-f", "mpegts",
-                "-i", "pipe:0",
-                "-frames:v", "1",
-                "-f", "image2",
-                "-vcodec", "mjpeg",
-                "-q:v", "2",
-                "pipe:1",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            logger.info(f"[COHN {serial}] ffmpeg+UDP proxy on port {port}")
+        # Start ffmpeg reading from stdin pipe
+        popen_kwargs = {}
+        if sys.platform == "win32":
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        proc = await asyncio.create_subprocess_exec(
+            ffmpeg_bin,
+            "-y",
+            "-fflags", "nobuffer+discardcorrupt+genpts",
+            "-analyzeduration", "10000000",
+            "-probesize", "5000000",
+            "-f", "mpegts",
+            "-i", "pipe:0",
+            "-frames:v", "1",
+            "-f", "image2",
+            "-vcodec", "mjpeg",
+            "-q:v", "2",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        logger.info(f"[COHN {serial}] ffmpeg+UDP proxy on port {port}")
 
-            # Start UDP→pipe thread
-            pipe_thread = threading.Thread(
-                target=_udp_to_pipe_thread,
-                args=(udp_sock, proc.stdin, stop_event),
-                daemon=True,
-            )
-            pipe_thread.start()
+        # Hand the bound socket to the event loop: packets go straight to ffmpeg stdin
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _UdpToPipeProtocol(proc.stdin), sock=udp_sock
+        )
+        udp_sock = None  # now owned by the transport
 
-            # Trigger the stream
-            resp = await client.get(
-                f"https://{ip}/gopro/webcam/preview", headers=headers
-            )
-            if resp.status_code != 200:
-                stop_event.set()
-                proc.kill()
-                udp_sock.close()
-                await client.get(f"https://{ip}/gopro/webcam/stop", headers=headers)
-                return {"serial": serial, "name": name, "error": f"webcam/preview HTTP {resp.status_code}"}
+        # Trigger the stream
+        resp = await _COHN_HTTP.get(
+            f"https://{ip}/gopro/webcam/preview", headers=headers
+        )
+        if resp.status_code != 200:
+            transport.close()
+            proc.kill()
+            await _COHN_HTTP.get(f"https://{ip}/gopro/webcam/stop", headers=headers)
+            return {"serial": serial, "name": name, "error": f"webcam/preview HTTP {resp.status_code}"}
 
-            logger.info(f"[COHN {serial}] webcam/preview triggered, waiting for frame...")
+        logger.info(f"[COHN {serial}] webcam/preview triggered, waiting for frame...")
 
-            # Wait for ffmpeg to capture one frame
-            try:
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=12)
-            except asyncio.TimeoutError:
-                proc.kill()
-                stdout = b""
-                stderr = b""
-                logger.warning(f"[COHN {serial}] ffmpeg timed out waiting for frame")
-
-            # Signal thread to stop and clean up
-            stop_event.set()
-            udp_sock.close()
-            udp_sock = None
+        # Wait for ffmpeg to emit one frame; stderr is drained in big reads, tail kept for logs
+        stderr_task = asyncio.create_task(_read_tail(proc.stderr))
+        try:
+            stdout = await asyncio.wait_for(_read_jpeg(proc.stdout), timeout=12)
+        except asyncio.TimeoutError:
+            stdout = b""
+            logger.warning(f"[COHN {serial}] ffmpeg timed out waiting for frame")
+        # Frame is out (or we gave up) — don't wait for ffmpeg's own shutdown
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        stderr = await stderr_task
 
-            # Stop webcam
-            for cleanup_path in ["/gopro/webcam/stop", "/gopro/webcam/exit"]:
-                try:
-                    await client.get(f"https://{ip}{cleanup_path}", headers=headers)
-                except Exception:
-                    pass
+        # Stop forwarding packets
+        transport.close()
 
-            if stdout and len(stdout) > 500:
-                logger.info(f"[COHN {serial}] Snapshot captured: {len(stdout)} bytes")
-                return {
-                    "serial": serial,
-                    "name": name,
-                    "dataUrl": f"data:image/jpeg;base64,{base64.b64encode(stdout).decode()}",
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
-                }
-            stderr_text = stderr.decode(errors='ignore')[-200:] if stderr else "no stderr"
-            logger.warning(f"[COHN {serial}] No frame captured. ffmpeg stderr: {stderr_text}")
-            return {"serial": serial, "name": name, "error": "No frame captured"}
+        # Stop webcam
+        await _cohn_webcam_cleanup(ip, headers)
+
+        if stdout and len(stdout) > 500:
+            logger.info(f"[COHN {serial}] Snapshot captured: {len(stdout)} bytes")
+            return _store_snapshot(serial, name, stdout)
+        stderr_text = stderr.decode(errors='ignore')[-200:] if stderr else "no stderr"
+        logger.warning(f"[COHN {serial}] No frame captured. ffmpeg stderr: {stderr_text}")
+        return {"serial": serial, "name": name, "error": "No frame captured"}
     except Exception as e:
         logger.error(f"[COHN {serial}] Snapshot error: {e}")
-        stop_event.set()
         if proc and proc.returncode is None:
             proc.kill()
         return {"serial": serial, "name": name, "error": str(e)}
     finally:
+        if transport:
+            transport.close()
         if udp_sock:
             try:
                 udp_sock.close()
@@ -3498,48 +3766,60 @@ async def _capture_single_snapshot_inner(serial: str, ip: str, auth: str, port:
                 pass
 
 
-async def _capture_single_snapshot(serial: str, ip: str, auth: str, port: int, name: str) -> dict:
-    """Wrapper with one retry: on error, cleanup webcam state, wait 2s, try again."""
-    result = await _capture_single_snapshot_inner(serial, ip, auth, port, name)
-    if "error" not in result:
-        return result
+def _snapshot_sem() -> asyncio.Semaphore:
+    """Created on first use so it binds to the serving loop (Python 3.9 binds at construction)"""
+    global _SNAPSHOT_SEM
+    if _SNAPSHOT_SEM is None:
+        _SNAPSHOT_SEM = asyncio.Semaphore(int(os.environ.get("COHN_SNAPSHOT_PARALLEL", "6")))
+    return _SNAPSHOT_SEM
 
-    logger.info(f"[COHN {serial}] Snapshot failed ({result.get('error')}), retrying once...")
-    # Cleanup webcam state before retry
-    headers = {"Authorization": auth} if auth else {}
-    try:
-        async with httpx.AsyncClient(verify=False, timeout=5.0) as client:
-            for path in ["/gopro/webcam/stop", "/gopro/webcam/exit"]:
-                try:
-                    await client.get(f"https://{ip}{path}", headers=headers)
-                except Exception:
-                    pass
-    except Exception:
-        pass
-    await asyncio.sleep(2)
-    return await _capture_single_snapshot_inner(serial, ip, auth, port, name)
+
+async def _capture_single_snapshot(serial: str, ip: str, auth: str, port: int, name: str) -> dict:
+    """Wrapper with one retry: on error, cleanup webcam state, wait 2s, try again.
+    Holds a _SNAPSHOT_SEM slot for the whole capture so large fleets are throttled."""
+    async with _snapshot_sem():
+        result = await _capture_single_snapshot_inner(serial, ip, auth, port, name)
+        if "error" not in result:
+            return result
+
+        logger.info(f"[COHN {serial}] Snapshot failed ({result.get('error')}), retrying once...")
+        # Cleanup webcam state before retry
+        headers = {"Authorization": auth} if auth else {}
+        await _cohn_webcam_cleanup(ip, headers, timeout=5.0)
+        await asyncio.sleep(2)
+        return await _capture_single_snapshot_inner(serial, ip, auth, port, name)
+
+
+async def _snapshot_camera(serial: str, ip: str, auth: str, port: int, name: str) -> dict:
+    """Snapshot from the live preview stream when one is running, else via a webcam session."""
+    if serial in _cohn_stream_clients:
+        result = await _grab_keyframe_from_live_stream(serial, name)
+        if result:
+            return result
+    return await _capture_single_snapshot(serial, ip, auth, port, name)
 
 
 @app.post("/api/cohn/snapshot/all")
-async def cohn_snapshot_all():
+async def cohn_snapshot_all(fresh: bool = False):
     """Capture a single JPEG frame from each online COHN camera (no live preview needed).
-    Uses check_all_cameras() which includes IP recovery via ARP when DHCP IPs change."""
+    Online state comes from the background refresher, which includes IP recovery via
+    ARP when DHCP IPs change; pass ?fresh=true to probe now."""
     all_creds = cohn_manager.get_all_credentials()
     if not all_creds:
         raise HTTPException(status_code=400, detail="No COHN-provisioned cameras")
 
-    # Use check_all_cameras() which includes ARP-based IP recovery
-    online_status = await cohn_manager.check_all_cameras()
+    online_status = await _get_cohn_online(fresh)
 
-    tasks = []
-    errors = {}
-    for idx, (serial, creds) in enumerate(all_creds.items()):
-        if not online_status.get(serial, False):
-            errors[serial] = "Camera offline (unreachable after IP recovery attempt)"
-            continue
-        # Re-read creds after check_all_cameras (IP may have been updated by recovery)
-        creds = cohn_manager.get_credentials(serial) or creds
-        ip = creds.get("ip_address")
+    offline_error = "Camera offline (unreachable after IP recovery attempt)"
+    errors = {serial: offline_error for serial in all_creds if not online_status.get(serial, False)}
+    online_serials = [serial for serial in all_creds if serial not in errors]
+    if not online_serials:
+        return {"snapshots": {}, "errors": errors, "error": "No online COHN cameras found"}
+
+    tasks = {}
+    for idx, serial in enumerate(online_serials):
+        # Inner creds dicts are shared with the manager, so IP recovery is already reflected
+        ip = all_creds[serial].get("ip_address")
         if not ip:
             errors[serial] = "No IP address"
             continue
@@ -3549,14 +3829,14 @@ async def cohn_snapshot_all():
         if cam:
             cam_name = cam.name or cam_name
         port = _SNAPSHOT_BASE_PORT + idx
-        tasks.append(_capture_single_snapshot(serial, ip, auth, port, cam_name))
+        tasks[serial] = _snapshot_camera(serial, ip, auth, port, cam_name)
 
     if not tasks:
         return {"snapshots": {}, "errors": errors, "error": "No online COHN cameras found"}
 
-    results_list = await asyncio.gather(*tasks, return_exceptions=True)
+    settled = await _gather_by_serial(tasks)
     snapshots = {}
-    for result in results_list:
+    for result in settled.values():
         if isinstance(result, dict) and "serial" in result:
             snapshots[result["serial"]] = result
             if "error" in result:
@@ -3567,6 +3847,20 @@ async def cohn_snapshot_all():
     return {"snapshots": snapshots, "errors": errors}
 
 
+@app.get("/api/cohn/snapshot/blob/{serial}")
+async def cohn_snapshot_blob(serial: str, request: Request):
+    """Serve the most recent snapshot JPEG captured for a camera.
+    no-cache + ETag: the browser revalidates, and gets a bodiless 304 until a new capture lands."""
+    entry = _SNAPSHOT_CACHE.get(serial)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No snapshot for camera {serial}")
+    jpeg, etag = entry
+    headers = {"Cache-Control": "no-cache", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=jpeg, media_type="image/jpeg", headers=headers)
+
+
 @app.post("/api/cohn/preview/start")
 async def start_cohn_preview_all():
     """Start preview on all COHN-provisioned cameras"""
@@ -3575,21 +3869,16 @@ async def start_cohn_preview_all():
         raise HTTPException(status_code=400, detail="No COHN-provisioned cameras")
 
     results = {}
-    tasks = []
-    serials = []
-
-    for serial, creds in all_creds.items():
-        tasks.append(_start_single_cohn_preview(serial, creds))
-        serials.append(serial)
-
-    task_results = await asyncio.gather(*tasks, return_exceptions=True)
-    for serial, result in zip(serials, task_results):
+    settled = await _gather_by_serial(
+        {serial: _start_single_cohn_preview(serial, creds) for serial, creds in all_creds.items()}
+    )
+    for serial, result in settled.items():
         if isinstance(result, Exception):
             results[serial] = {"success": False, "error": str(result)}
         else:
             results[serial] = result
 
-        await broadcast_message({
+        _broadcast_nowait({
             "type": "cohn_preview_started",
             "serial": serial,
             "success": results[serial].get("success", False),
@@ -3626,21 +3915,16 @@ async def stop_cohn_preview_all():
         raise HTTPException(status_code=400, detail="No COHN-provisioned cameras")
 
     results = {}
-    tasks = []
-    serials = []
-
-    for serial, creds in all_creds.items():
-        tasks.append(_stop_single_cohn_preview(serial, creds))
-        serials.append(serial)
-
-    task_results = await asyncio.gather(*tasks, return_exceptions=True)
-    for serial, result in zip(serials, task_results):
+    settled = await _gather_by_serial(
+        {serial: _stop_single_cohn_preview(serial, creds) for serial, creds in all_creds.items()}
+    )
+    for serial, result in settled.items():
         if isinstance(result, Exception):
             results[serial] = {"success": False, "error": str(result)}
         else:
             results[serial] = result
 
-        await broadcast_message({
+        _broadcast_nowait({
             "type": "cohn_preview_stopped",
             "serial": serial,
             "success": results[serial].get("success", False)
@@ -3679,6 +3963,56 @@ async def health_check():
     }
 
 
+_BULK_UPLOAD_SEM: Optional[asyncio.Semaphore] = None  # Concurrent folder ZIP streams (see _bulk_upload_sem)
+
+
+def _bulk_upload_sem() -> asyncio.Semaphore:
+    """Created on first use so it binds to the serving loop (Python 3.9 binds at construction)"""
+    global _BULK_UPLOAD_SEM
+    if _BULK_UPLOAD_SEM is None:
+        _BULK_UPLOAD_SEM = asyncio.Semaphore(int(os.environ.get("BULK_UPLOAD_PARALLEL", "3")))
+    return _BULK_UPLOAD_SEM
+
+
+async def _zip_and_upload_folder(folder_name: str, files_info: List[dict], backend_url: str, api_key: str) -> dict:
+    """Stream one folder's files as a ZIP to S3 and return its upload result.
+    Holds a _BULK_UPLOAD_SEM slot so a camera with many date folders doesn't
+    start a zip thread and an upload per folder all at once."""
+    file_paths = [Path(f["path"]) for f in files_info]
+    zip_filename = f"{folder_name}.zip"
+
+    # Stream a STORED ZIP straight into the upload (no temp file; media
+    # is already compressed so DEFLATE would only burn CPU)
+    s3_key = f"zips/{zip_filename}"
+    zip_entries = [(file_path, file_path.name) for file_path in file_paths]  # Just filenames in ZIP
+    logger.info(
+        f"Processing folder: {folder_name} ({len(file_paths)} files)\n"
+        f"Streaming {zip_filename} to S3 (key: {s3_key})...\n"
+        + "\n".join(f"  Adding: {file_path.name}" for file_path in file_paths)
+    )
+
+    async with _bulk_upload_sem():
+        s3_url, zip_size = await download_manager.upload_zip_to_backend(
+            zip_entries, s3_key, backend_url, api_key
+        )
+    if not s3_url:
+        s3_url = f"https://storage.cloud.com/{s3_key}"
+
+    zip_size_mb = zip_size / (1024 * 1024)
+    logger.info(
+        f"✅ {zip_filename} uploaded successfully!\n"
+        f"📊 Size: {zip_size_mb:.1f} MB | Files: {len(file_paths)}\n"
+        f"🔗 URL: {s3_url}"
+    )
+    return {
+        "folder": folder_name,
+        "zip_filename": zip_filename,
+        "zip_url": s3_url,
+        "zip_size_mb": round(zip_size_mb, 2),
+        "files_count": len(file_paths)
+    }
+
+
 @app.post("/api/upload-camera-bulk/{serial}")
 async def upload_camera_bulk(serial: str, upload_data: dict):
     """Upload all files from a specific camera as a single ZIP"""
@@ -3689,81 +4023,33 @@ async def upload_camera_bulk(serial: str, upload_data: dict):
         if not backend_url or not api_key:
             raise HTTPException(status_code=400, detail="backend_url and api_key required")
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"📦 BULK UPLOAD REQUEST for camera {serial}")
 
-        # Get all files grouped by camera
-        grouped_files = download_manager.get_files_grouped_by_camera()
-
-        # Find the folder(s) for this camera serial
-        camera_folders = [folder for folder in grouped_files.keys() if serial in folder]
+        # This camera's files grouped by folder (directory walk stats files; keep it off the loop)
+        grouped_files = await asyncio.to_thread(download_manager.get_files_grouped_by_camera, serial)
+        camera_folders = list(grouped_files)
 
         if not camera_folders:
             raise HTTPException(status_code=404, detail=f"No files found for camera {serial}")
 
         logger.info(f"Found {len(camera_folders)} folder(s) for camera {serial}")
 
-        upload_results = []
-
-        # Create and upload a ZIP for each folder (date)
-        for folder_name in camera_folders:
-            files_info = grouped_files[folder_name]
-            file_paths = [Path(f["path"]) for f in files_info]
-
-            logger.info(f"Processing folder: {folder_name} ({len(file_paths)} files)")
-
-            # Create ZIP
-            import zipfile
-            import tempfile
-
-            zip_filename = f"{folder_name}.zip"
-
-            with tempfile.NamedTemporaryFile(mode='w+b', suffix='.zip', delete=False) as temp_zip:
-                temp_zip_path = Path(temp_zip.name)
-
-                logger.info(f"Creating ZIP: {zip_filename}")
-
-                with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in file_paths:
-                        # Just use filename in ZIP (no subfolders)
-                        logger.info(f"  Adding: {file_path.name}")
-                        zipf.write(file_path, arcname=file_path.name)
-
-                zip_size_mb = temp_zip_path.stat().st_size / (1024 * 1024)
-                logger.info(f"✓ ZIP created: {zip_size_mb:.1f} MB")
-
-                # Upload ZIP to S3 via shared helper
-                s3_key = f"zips/{zip_filename}"
-                logger.info(f"Uploading {zip_filename} to S3 (key: {s3_key})...")
-
-                s3_url = await download_manager.upload_file_to_backend(
-                    temp_zip_path, s3_key,
-                    backend_url, api_key,
-                    content_type="application/zip"
-                )
-                if not s3_url:
-                    s3_url = f"https://storage.cloud.com/{s3_key}"
-
-                # Clean up temp file
-                temp_zip_path.unlink()
-
-                upload_results.append({
-                    "folder": folder_name,
-                    "zip_filename": zip_filename,
-                    "zip_url": s3_url,
-                    "zip_size_mb": round(zip_size_mb, 2),
-                    "files_count": len(file_paths)
-                })
-
-                logger.info("")
-                logger.info(f"✅ {zip_filename} uploaded successfully!")
-                logger.info(f"📊 Size: {zip_size_mb:.1f} MB | Files: {len(file_paths)}")
-                logger.info(f"🔗 URL: {s3_url}")
+        # One ZIP per folder (date), uploaded concurrently; a failed folder fails the
+        # request, but only after its siblings have finished rather than orphaning them
+        settled = await _gather_by_serial({
+            folder_name: _zip_and_upload_folder(folder_name, grouped_files[folder_name], backend_url, api_key)
+            for folder_name in camera_folders
+        })
+        for result in settled.values():
+            if isinstance(result, Exception):
+                raise result
+        upload_results = list(settled.values())
 
-        logger.info("=" * 60)
+        logger.info(_BAR)
         logger.info(f"✅ BULK UPLOAD COMPLETE for camera {serial}")
         logger.info(f"Total ZIPs created: {len(upload_results)}")
-        logger.info("=" * 60)
+        logger.info(_BAR)
 
         return {
             "success": True,
@@ -3854,4 +4140,11 @@ async def test_s3_backend(test_data: dict):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
+    try:
+        # uvicorn[standard] installs uvloop on macOS/Linux; importing it here also makes
+        # PyInstaller bundle it (loop="auto" silently fell back to asyncio when frozen)
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"  # Windows
+    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info", loop=loop_impl)
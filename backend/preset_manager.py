@@ -3,6 +3,7 @@ Preset Manager — Save/Load/Push camera settings presets
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional
@@ -12,9 +13,14 @@ logger = logging.getLogger(__name__)
 
 class PresetManager:
     PRESETS_FILE = Path(__file__).parent.parent / "camera_presets.json"
+    # Keys that are camera settings (everything else is metadata like created_at/pinned)
+    SETTING_KEYS = frozenset({"resolution", "fps", "video_fov", "hypersmooth", "anti_flicker", "shutter"})
 
     def __init__(self):
         self.presets: Dict[str, dict] = {}
+        self._settings: Dict[str, dict] = {}  # name -> non-null setting values, built on first apply
+        # Single writer thread: saves stay off the event loop and land in mutation order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="presets")
         self._load()
 
     def _load(self):
@@ -32,11 +38,22 @@ class PresetManager:
             self.presets = {}
 
     def _save(self):
-        """Persist presets to JSON file"""
+        """Persist presets to JSON file. The snapshot is serialized here (small, fast);
+        the file write is queued on the writer thread."""
         try:
-            with open(self.PRESETS_FILE, 'w') as f:
-                json.dump(self.presets, f, indent=2)
-            logger.info(f"Saved {len(self.presets)} preset(s) to {self.PRESETS_FILE}")
+            text = json.dumps(self.presets, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save presets: {e}")
+            return
+        self._writer.submit(self._write, text, len(self.presets))
+
+    def _write(self, text: str, count: int):
+        """Write a sibling temp file, then atomically swap it in (runs on the writer thread)"""
+        tmp = self.PRESETS_FILE.with_suffix(".json.tmp")
+        try:
+            tmp.write_text(text)
+            tmp.replace(self.PRESETS_FILE)
+            logger.info(f"Saved {count} preset(s) to {self.PRESETS_FILE}")
         except Exception as e:
             logger.error(f"Failed to save presets: {e}")
 
@@ -49,6 +66,7 @@ class PresetManager:
             "created_at": datetime.now().isoformat(),
             "pinned": pinned,
         }
+        self._settings.pop(name, None)
         self._save()
         logger.info(f"Saved preset: {name}")
         return self.presets[name]
@@ -57,6 +75,18 @@ class PresetManager:
         """Get a single preset by name"""
         return self.presets.get(name)
 
+    def get_settings(self, name: str) -> Optional[dict]:
+        """Just the camera settings of a preset (None values dropped), or None if not found"""
+        settings = self._settings.get(name)
+        if settings is None:
+            preset = self.presets.get(name)
+            if preset is None:
+                return None
+            settings = self._settings[name] = {
+                k: v for k, v in preset.items() if k in self.SETTING_KEYS and v is not None
+            }
+        return settings
+
     def list_presets(self) -> Dict[str, dict]:
         """List all presets, pinned first"""
         # Sort: pinned first, then alphabetical
@@ -81,6 +111,7 @@ class PresetManager:
         """Delete a preset by name"""
         if name in self.presets:
             del self.presets[name]
+            self._settings.pop(name, None)
             self._save()
             logger.info(f"Deleted preset: {name}")
             return True
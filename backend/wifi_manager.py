@@ -1,11 +1,12 @@
 """
 Cross-platform WiFi Management
 """
+import asyncio
 import subprocess
 import platform
 import time
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -15,72 +16,69 @@ class WiFiManager:
         self.system = platform.system()
         self._original_wifi_ip = None  # Track original network by IP/gateway
 
-    def get_current_wifi(self) -> Optional[str]:
-        """Get current WiFi SSID (may return None on macOS 26+ due to privacy)"""
-        try:
-            if self.system == "Darwin":  # macOS
-                result = subprocess.run(
-                    ["networksetup", "-getairportnetwork", "en0"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if "Current Wi-Fi Network:" in result.stdout:
-                    return result.stdout.split("Current Wi-Fi Network:")[1].strip()
+    # Read-only probes: command per platform + parser shared by the sync and async versions
+    _SSID_COMMANDS = {
+        "Darwin": ["networksetup", "-getairportnetwork", "en0"],
+        "Windows": ["netsh", "wlan", "show", "interfaces"],
+        "Linux": ["nmcli", "-t", "-f", "active,ssid", "dev", "wifi"],
+    }
+    _IP_COMMANDS = {
+        "Darwin": ["ipconfig", "getifaddr", "en0"],
+        "Linux": ["hostname", "-I"],
+    }
+
+    def _parse_ssid(self, stdout: str) -> Optional[str]:
+        if self.system == "Darwin":  # macOS
+            if "Current Wi-Fi Network:" in stdout:
+                return stdout.split("Current Wi-Fi Network:")[1].strip()
+        elif self.system == "Windows":
+            for line in stdout.split('\n'):
+                if 'SSID' in line and 'BSSID' not in line:
+                    return line.split(':')[1].strip()
+        elif self.system == "Linux":
+            for line in stdout.split('\n'):
+                if line.startswith('yes:'):
+                    return line.split(':')[1]
+        return None
 
-            elif self.system == "Windows":
-                result = subprocess.run(
-                    ["netsh", "wlan", "show", "interfaces"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                for line in result.stdout.split('\n'):
-                    if 'SSID' in line and 'BSSID' not in line:
-                        return line.split(':')[1].strip()
+    @staticmethod
+    def _parse_ip(stdout: str) -> Optional[str]:
+        # macOS prints one address, Linux a space-separated list; take the first
+        fields = stdout.split()
+        return fields[0] if fields else None
 
-            elif self.system == "Linux":
-                result = subprocess.run(
-                    ["nmcli", "-t", "-f", "active,ssid", "dev", "wifi"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                for line in result.stdout.split('\n'):
-                    if line.startswith('yes:'):
-                        return line.split(':')[1]
+    @staticmethod
+    def _windows_ip() -> Optional[str]:
+        import socket
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+        finally:
+            s.close()
 
+    def get_current_wifi(self) -> Optional[str]:
+        """Get current WiFi SSID (may return None on macOS 26+ due to privacy)"""
+        cmd = self._SSID_COMMANDS.get(self.system)
+        if not cmd:
+            return None
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            return self._parse_ssid(result.stdout)
         except Exception as e:
             logger.warning(f"Error getting current WiFi: {e}")
-
         return None
 
     def get_current_ip(self) -> Optional[str]:
         """Get current IP address (cross-platform)"""
         try:
-            if self.system == "Darwin":  # macOS
-                result = subprocess.run(
-                    ["ipconfig", "getifaddr", "en0"],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    return result.stdout.strip()
-            elif self.system == "Windows":
-                import socket
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                try:
-                    s.connect(("10.255.255.255", 1))
-                    ip = s.getsockname()[0]
-                finally:
-                    s.close()
-                return ip
-            elif self.system == "Linux":
-                result = subprocess.run(
-                    ["hostname", "-I"],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    return result.stdout.strip().split()[0]
+            if self.system == "Windows":
+                return self._windows_ip()
+            cmd = self._IP_COMMANDS.get(self.system)
+            if cmd:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                if result.returncode == 0:
+                    return self._parse_ip(result.stdout)
         except Exception:
             pass
         return None
@@ -90,6 +88,78 @@ class WiFiManager:
         ip = self.get_current_ip()
         return ip is not None and ip.startswith("10.5.5.")
 
+    def snapshot(self) -> Tuple[Optional[str], Optional[str], bool]:
+        """(SSID, IP, on GoPro network) in one call, with a single IP lookup"""
+        ip = self.get_current_ip()
+        return self.get_current_wifi(), ip, ip is not None and ip.startswith("10.5.5.")
+
+    def get_home_ip(self) -> Optional[str]:
+        """Current IP if on a non-GoPro network, else None (a single IP lookup)"""
+        ip = self.get_current_ip()
+        return ip if ip and not ip.startswith("10.5.5.") else None
+
+    async def _async_run(self, cmd: list, timeout: float = 5) -> Optional[subprocess.CompletedProcess]:
+        """Run a short probe command without blocking the event loop (None on failure/timeout)"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+        except NotImplementedError:
+            # Event loop without subprocess support (e.g. Windows selector loop)
+            return await asyncio.to_thread(
+                subprocess.run, cmd, capture_output=True, text=True, timeout=timeout
+            )
+        except OSError:
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout.decode(errors="replace"))
+
+    async def async_get_current_wifi(self) -> Optional[str]:
+        """Async get_current_wifi (child process awaited on the event loop, no thread)"""
+        cmd = self._SSID_COMMANDS.get(self.system)
+        if not cmd:
+            return None
+        try:
+            result = await self._async_run(cmd)
+            return self._parse_ssid(result.stdout) if result else None
+        except Exception as e:
+            logger.warning(f"Error getting current WiFi: {e}")
+        return None
+
+    async def async_get_current_ip(self) -> Optional[str]:
+        """Async get_current_ip"""
+        try:
+            if self.system == "Windows":
+                return self._windows_ip()
+            cmd = self._IP_COMMANDS.get(self.system)
+            if cmd:
+                result = await self._async_run(cmd)
+                if result and result.returncode == 0:
+                    return self._parse_ip(result.stdout)
+        except Exception:
+            pass
+        return None
+
+    async def async_is_on_gopro_network(self) -> bool:
+        """Async is_on_gopro_network"""
+        ip = await self.async_get_current_ip()
+        return ip is not None and ip.startswith("10.5.5.")
+
+    async def async_snapshot(self) -> Tuple[Optional[str], Optional[str], bool]:
+        """Async snapshot(): both probes run concurrently"""
+        ssid, ip = await asyncio.gather(self.async_get_current_wifi(), self.async_get_current_ip())
+        return ssid, ip, ip is not None and ip.startswith("10.5.5.")
+
+    async def async_get_home_ip(self) -> Optional[str]:
+        """Async get_home_ip"""
+        ip = await self.async_get_current_ip()
+        return ip if ip and not ip.startswith("10.5.5.") else None
+
     def connect_wifi(self, ssid: str, password: str, timeout: int = 30) -> bool:
         """Connect to WiFi network"""
         logger.info("=" * 60)
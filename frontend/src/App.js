@@ -74,8 +74,8 @@ function App() {
       case 'recording_started':
         setCameras(prevCameras =>
           prevCameras.map(cam =>
-            cam.serial === data.serial
-              ? { ...cam, recording: data.success }
+            cam.serial in data.results
+              ? { ...cam, recording: data.results[cam.serial] }
               : cam
           )
         );
@@ -83,7 +83,7 @@ function App() {
       case 'recording_stopped':
         setCameras(prevCameras =>
           prevCameras.map(cam =>
-            cam.serial === data.serial
+            cam.serial in data.results
               ? { ...cam, recording: false }
               : cam
           )
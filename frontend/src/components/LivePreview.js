@@ -635,7 +635,7 @@ function LivePreview({ cameras, apiUrl, cohnStatus, onCohnUpdate, subscribeWsMes
         ctx.drawImage(videoEl, 0, 0);
         try {
           snaps[camera.serial] = {
-            dataUrl: canvas.toDataURL('image/jpeg', 0.92),
+            src: canvas.toDataURL('image/jpeg', 0.92),
             name: camera.name || `GoPro ${camera.serial}`,
             serial: camera.serial,
             timestamp: new Date().toLocaleTimeString(),
@@ -659,8 +659,8 @@ function LivePreview({ cameras, apiUrl, cohnStatus, onCohnUpdate, subscribeWsMes
         const backendSnaps = resp.data?.snapshots || {};
         const backendErrors = resp.data?.errors || {};
         for (const [serial, snap] of Object.entries(backendSnaps)) {
-          if (snap.dataUrl && !snaps[serial]) {
-            snaps[serial] = snap;
+          if (snap.url && !snaps[serial]) {
+            snaps[serial] = { ...snap, src: `${apiUrl}${snap.url}` };
           }
         }
         // Show per-camera errors
@@ -715,6 +715,7 @@ function LivePreview({ cameras, apiUrl, cohnStatus, onCohnUpdate, subscribeWsMes
     let loaded = 0;
     snapsArr.forEach((snap, idx) => {
       const img = new Image();
+      img.crossOrigin = 'anonymous';  // Backend snapshots are fetched by URL; keep the canvas exportable
       img.onload = () => {
         const col = idx % cols;
         const row = Math.floor(idx / cols);
@@ -734,7 +735,7 @@ function LivePreview({ cameras, apiUrl, cohnStatus, onCohnUpdate, subscribeWsMes
           link.click();
         }
       };
-      img.src = snap.dataUrl;
+      img.src = snap.src;
     });
   }, [snapshots]);
 
@@ -1259,7 +1260,7 @@ function LivePreview({ cameras, apiUrl, cohnStatus, onCohnUpdate, subscribeWsMes
             <div className={`snapshot-grid ${Object.keys(snapshots).length % 2 === 0 ? 'snap-2col' : 'snap-3col'}`}>
               {Object.values(snapshots).map((snap) => (
                 <div key={snap.serial} className="snapshot-item">
-                  <img src={snap.dataUrl} alt={snap.name} className="snapshot-img" />
+                  <img src={snap.src} alt={snap.name} className="snapshot-img" />
                   <div className="snapshot-label">
                     <span className="snapshot-name">{snap.name}</span>
                     <span className="snapshot-serial">{snap.serial}</span>